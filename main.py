@@ -1,14 +1,19 @@
 import os
+import asyncio
 import logging
 import uuid
 import sqlite3
-import re  # For the escape function
 import random  # For shuffling players
 import shlex
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Any
 from datetime import datetime, timezone
-import math
-from flask import Flask
-from threading import Thread
+from pathlib import Path
 from telegram.helpers import escape_markdown
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.error import Forbidden
@@ -29,9 +34,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+# Public HTTPS base URL of this service. When set, Telegram pushes updates to
+# a webhook instead of the bot long polling getUpdates.
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
+PORT = int(os.environ.get("PORT", "8080"))
+# In webhook mode PORT belongs to the webhook server, which only answers on
+# /<BOT_TOKEN>; set this to serve the keep-alive endpoint on its own port.
+KEEPALIVE_PORT = os.environ.get("KEEPALIVE_PORT")
 # Define the persistent data directory Render will provide at /var/data
 DATA_DIR = "/data"
 DB_NAME = os.path.join(DATA_DIR, "tournaments.db")
+# Oldest SQLite the schema and queries run on: UPSERT needs 3.24, window
+# functions 3.25, the generated goal_difference columns 3.31 and
+# UPDATE ... RETURNING 3.35.
+MIN_SQLITE_VERSION = (3, 35, 0)
 
 # Ensure the data directory exists when the bot starts
 if not os.path.exists(DATA_DIR):
@@ -43,25 +59,256 @@ POINTS_FOR_DRAW = 1
 POINTS_FOR_LOSS = 0
 
 
+# MarkdownV2 special characters (plus the backslash itself) mapped to their
+# escaped form, so escaping is a single C-level str.translate call.
+_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in "\\_*[]()~`>#+-=|{}.!"})
+
+
 def escape_markdown_v2(text: str) -> str:
     """Escapes characters that have special meaning in MarkdownV2."""
     if not isinstance(text, str):
         text = str(text)
-    escape_chars = r"_*\[\]()~`>#\+\-=|{}\.!"
-    return re.sub(f"([{re.escape(escape_chars)}])", r"\\\1", text)
+    return text.translate(_ESCAPE_TABLE)
+
+
+def parse_score(score_str: str) -> tuple[int, int] | None:
+    """Parses a 'p1-p2' score string, returning None if it is malformed."""
+    p1_str, sep, p2_str = (score_str or "").partition("-")
+    if not sep or not p1_str.isdigit() or not p2_str.isdigit():
+        return None
+    return int(p1_str), int(p2_str)
+
+
+# --- Connection pool ---
+# SELECT helpers borrow a read-only connection from a pool instead of opening
+# one per call, so SQLite's page cache survives between handler invocations;
+# LIFO hands out the most recently used (warmest) connection first. SQLite
+# allows a single writer at a time, so all writes go through one dedicated
+# connection serialized by a lock rather than queueing on the file lock.
+DB_POOL_SIZE = 8
+_db_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_write_conn: sqlite3.Connection | None = None
+_write_lock = threading.RLock()
+
+
+def _configure_connection(conn: sqlite3.Connection, read_only: bool = False) -> None:
+    """Applies the PRAGMAs every connection should run with.
+
+    journal_mode=WAL is persistent in the database file; the rest are
+    per-connection and must be set each time a connection is opened.
+    Read-only connections skip the settings that only matter for writes.
+    """
+    if not read_only:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        # Keep dirty pages of large batch writes in memory until COMMIT
+        # instead of spilling them (and taking the exclusive lock) early.
+        conn.execute("PRAGMA cache_spill=OFF")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped reads
+
+
+def _open_connection(read_only: bool = False) -> sqlite3.Connection:
+    """Opens a new SQLite connection for the read pool or the writer."""
+    # A larger statement cache keeps every helper's SQL compiled for the
+    # lifetime of the connection. Autocommit (isolation_level=None): single
+    # statements commit on their own and multi-statement writes open their
+    # transaction explicitly via db_tx().
+    if read_only:
+        conn = sqlite3.connect(
+            f"{Path(DB_NAME).resolve().as_uri()}?mode=ro", uri=True,
+            check_same_thread=False, cached_statements=256, isolation_level=None
+        )
+    else:
+        conn = sqlite3.connect(
+            DB_NAME, check_same_thread=False, cached_statements=256, isolation_level=None
+        )
+    _configure_connection(conn, read_only=read_only)
+    # C-level mapping rows: row["col"] access without building a dict per row
+    conn.row_factory = sqlite3.Row
+    return conn
+
 
+@contextmanager
+def get_conn(row_factory=None):
+    """
+    Borrows a pooled read-only connection and returns it to the pool
+    afterwards. row_factory overrides the default sqlite3.Row for this
+    borrow only. Use get_write_conn() or db_tx() for writes.
+    """
+    try:
+        conn = _db_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(read_only=True)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    try:
+        yield conn
+    finally:
+        # Never hand back a connection with a dangling transaction or a
+        # caller-specific row factory.
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = sqlite3.Row
+        try:
+            _db_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
 
-def dict_factory(cursor, row):
-    """Converts SQL rows to dictionaries."""
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
+
+@contextmanager
+def get_write_conn():
+    """
+    Holds the single write connection for the duration of the block.
+    Each statement autocommits; use db_tx() for multi-statement writes.
+    """
+    global _write_conn
+    with _write_lock:
+        if _write_conn is None:
+            _write_conn = _open_connection()
+        conn = _write_conn
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+
+
+@contextmanager
+def db_tx():
+    """
+    Runs a block of writes on the write connection as a single transaction.
+    BEGIN IMMEDIATE takes the write lock up front; the block is committed on
+    exit and rolled back if it raises. Never await inside the block.
+    """
+    with get_write_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    # The block may have written tournament rows.
+    invalidate_tournament_cache()
+
+
+def _scalar(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> Any:
+    """Runs a single-value query and returns that value, or None if no row."""
+    row = conn.execute(sql, params).fetchone()
+    return None if row is None else row[0]
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    Runs a blocking DB helper in a worker thread so a slow query doesn't
+    stall the event loop. The pool is thread-safe; keep check-then-write
+    sequences in one synchronous call so no other update interleaves.
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def db_op(default: Any = None):
+    """
+    Decorates a DB helper so a sqlite3.Error is logged and `default` is
+    returned instead. The pooled connections already roll back on the way
+    out, so the helper itself needs no try/except.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.Error as e:
+                logger.error(f"DB {func.__name__}: {e}")
+                return default
+        return wrapper
+    return decorator
+
+
+# Standings tables. goal_difference is a virtual generated column, so it can
+# never drift from goals_for/goals_against and is not written by any UPDATE.
+_ROUND_ROBIN_STANDINGS_COLUMNS = """
+    tournament_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    games_played INTEGER DEFAULT 0,
+    wins INTEGER DEFAULT 0,
+    draws INTEGER DEFAULT 0,
+    losses INTEGER DEFAULT 0,
+    goals_for INTEGER DEFAULT 0,
+    goals_against INTEGER DEFAULT 0,
+    goal_difference INTEGER GENERATED ALWAYS AS (goals_for - goals_against) VIRTUAL,
+    points INTEGER DEFAULT 0,
+    PRIMARY KEY (tournament_id, user_id),
+    FOREIGN KEY (tournament_id) REFERENCES tournaments (id)
+"""
+_GROUP_STAGE_STANDINGS_COLUMNS = """
+    tournament_id TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    games_played INTEGER DEFAULT 0,
+    wins INTEGER DEFAULT 0,
+    draws INTEGER DEFAULT 0,
+    losses INTEGER DEFAULT 0,
+    goals_for INTEGER DEFAULT 0,
+    goals_against INTEGER DEFAULT 0,
+    goal_difference INTEGER GENERATED ALWAYS AS (goals_for - goals_against) VIRTUAL,
+    points INTEGER DEFAULT 0,
+    PRIMARY KEY (tournament_id, group_id, user_id),
+    FOREIGN KEY (tournament_id) REFERENCES tournaments (id),
+    FOREIGN KEY (group_id) REFERENCES groups_tournament (group_id)
+"""
+
+
+def _migrate_generated_goal_difference(conn: sqlite3.Connection) -> None:
+    """
+    Rebuilds standings tables created while goal_difference was a plain
+    column. SQLite cannot turn an existing column into a generated one, so
+    the table is copied into the new layout and swapped in.
+    """
+    for table, columns_sql in (
+        ("round_robin_standings", _ROUND_ROBIN_STANDINGS_COLUMNS),
+        ("group_stage_standings", _GROUP_STAGE_STANDINGS_COLUMNS),
+    ):
+        # table_xinfo rows: (cid, name, type, notnull, dflt_value, pk, hidden);
+        # hidden is 0 for ordinary columns and 2/3 for generated ones.
+        columns = conn.execute(f"PRAGMA table_xinfo({table})").fetchall()
+        if not any(col[1] == "goal_difference" and col[6] == 0 for col in columns):
+            continue
+        copied = ", ".join(
+            col[1] for col in columns if col[1] != "goal_difference" and col[6] == 0
+        )
+        # Rows written before foreign keys were enforced may not satisfy them,
+        # so enforcement is off while the rows are copied (as the SQLite
+        # ALTER TABLE docs prescribe for table rebuilds).
+        conn.execute("PRAGMA foreign_keys=OFF")
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f"CREATE TABLE {table}_new ({columns_sql})")
+            conn.execute(
+                f"INSERT INTO {table}_new ({copied}) SELECT {copied} FROM {table}"
+            )
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+        logger.info(f"Migrated {table}.goal_difference to a generated column.")
 
 
 def init_db():
     """Initializes or verifies the database schema."""
     conn = sqlite3.connect(DB_NAME)
+    _configure_connection(conn)
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -127,7 +374,7 @@ def init_db():
             status TEXT NOT NULL,
             next_match_id INTEGER,
             group_id INTEGER DEFAULT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)), -- Unix epoch seconds (UTC)
             FOREIGN KEY (tournament_id) REFERENCES tournaments (id),
             FOREIGN KEY (next_match_id) REFERENCES matches (match_id),
             FOREIGN KEY (group_id) REFERENCES groups_tournament (group_id)
@@ -143,28 +390,12 @@ def init_db():
             wins INTEGER DEFAULT 0,
             matches_played INTEGER DEFAULT 0,
             match_wins INTEGER DEFAULT 0,
-            last_win_timestamp TIMESTAMP
+            last_win_timestamp INTEGER -- Unix epoch milliseconds
         )
     """
     )
     cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS round_robin_standings (
-            tournament_id TEXT NOT NULL,
-            user_id INTEGER NOT NULL,
-            username TEXT NOT NULL,
-            games_played INTEGER DEFAULT 0,
-            wins INTEGER DEFAULT 0,
-            draws INTEGER DEFAULT 0,
-            losses INTEGER DEFAULT 0,
-            goals_for INTEGER DEFAULT 0,
-            goals_against INTEGER DEFAULT 0,
-            goal_difference INTEGER DEFAULT 0,
-            points INTEGER DEFAULT 0,
-            PRIMARY KEY (tournament_id, user_id),
-            FOREIGN KEY (tournament_id) REFERENCES tournaments (id)
-        )
-    """
+        f"CREATE TABLE IF NOT EXISTS round_robin_standings ({_ROUND_ROBIN_STANDINGS_COLUMNS})"
     )
     cursor.execute(
         """
@@ -189,26 +420,9 @@ def init_db():
     """
     )
     cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS group_stage_standings (
-            tournament_id TEXT NOT NULL,
-            group_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            username TEXT NOT NULL,
-            games_played INTEGER DEFAULT 0,
-            wins INTEGER DEFAULT 0,
-            draws INTEGER DEFAULT 0,
-            losses INTEGER DEFAULT 0,
-            goals_for INTEGER DEFAULT 0,
-            goals_against INTEGER DEFAULT 0,
-            goal_difference INTEGER DEFAULT 0,
-            points INTEGER DEFAULT 0,
-            PRIMARY KEY (tournament_id, group_id, user_id),
-            FOREIGN KEY (tournament_id) REFERENCES tournaments (id),
-            FOREIGN KEY (group_id) REFERENCES groups_tournament (group_id)
-        )
-    """
+        f"CREATE TABLE IF NOT EXISTS group_stage_standings ({_GROUP_STAGE_STANDINGS_COLUMNS})"
     )
+    _migrate_generated_goal_difference(conn)
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS score_submissions (
@@ -223,6 +437,52 @@ def init_db():
         )
     """
     )
+    # Indexes for the hot lookups: per-player history/stats/H2H, tournament
+    # match lists, a player's matches and wins within a tournament, standings
+    # in display order, registrations by user (newest first, for the username
+    # lookup) and "my/this chat's tournaments". The standings upserts are
+    # served by the tables' primary keys.
+    cursor.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_matches_p1_status ON matches (player1_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_matches_p2_status ON matches (player2_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_matches_tid_status_round
+            ON matches (tournament_id, status, round_number, match_in_round_index);
+        CREATE INDEX IF NOT EXISTS idx_matches_winner ON matches (winner_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_matches_tid_winner_status
+            ON matches (tournament_id, winner_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_matches_tid_p1
+            ON matches (tournament_id, player1_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_matches_tid_p2
+            ON matches (tournament_id, player2_user_id, status);
+        CREATE INDEX IF NOT EXISTS idx_rr_tid_sort
+            ON round_robin_standings (tournament_id, points DESC, goal_difference DESC, goals_for DESC, username);
+        CREATE INDEX IF NOT EXISTS idx_gs_tid_gid_sort
+            ON group_stage_standings (tournament_id, group_id, points DESC, goal_difference DESC, goals_for DESC, username);
+        DROP INDEX IF EXISTS idx_registrations_uid;
+        CREATE INDEX IF NOT EXISTS idx_registrations_uid_time
+            ON registrations (user_id, registration_time DESC);
+        CREATE INDEX IF NOT EXISTS idx_tournaments_creator_created
+            ON tournaments (creator_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_tournaments_chat_created
+            ON tournaments (group_chat_id, created_at DESC);
+    """
+    )
+    # Match timestamps used to be stored as ISO text; convert any left over
+    # to epoch seconds (the column's TIMESTAMP affinity keeps them INTEGER).
+    cursor.execute(
+        "UPDATE matches SET created_at = CAST(strftime('%s', created_at) AS INTEGER) "
+        "WHERE typeof(created_at) = 'text'"
+    )
+    # Same for the leaderboard's last win, now stored as epoch milliseconds
+    cursor.execute(
+        "UPDATE leaderboard_points SET last_win_timestamp = "
+        "CAST(strftime('%s', last_win_timestamp) AS INTEGER) * 1000 "
+        "WHERE typeof(last_win_timestamp) = 'text'"
+    )
+    conn.commit()
+    # Refresh planner statistics so the new indexes are actually chosen
+    cursor.execute("ANALYZE")
     conn.commit()
     conn.close()
     logger.info(
@@ -233,103 +493,115 @@ def init_db():
 # --- Database Helper Functions ---
 def add_tournament_to_db(details: dict) -> bool:
     """Adds a new tournament to the database."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            INSERT INTO tournaments (
-                id, creator_id, name, game, participants, type, status,
-                tournament_time, penalties, extra_time, conditions, group_chat_id,
-                num_groups, num_swiss_rounds, current_swiss_round, swiss_knockout_qualifiers
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                details["id"],
-                details["creator_id"],
-                details["name"],
-                details.get("game"),
-                details.get("participants"),
-                details.get("type"),
-                details.get("status"),
-                details.get("tournament_time"),
-                details.get("penalties"),
-                details.get("extra_time"),
-                details.get("conditions"),
-                details.get("group_chat_id"),
-                details.get("num_groups"),
-                details.get("num_swiss_rounds"),
-                details.get("current_swiss_round", 0),
-                details.get("swiss_knockout_qualifiers"),
-            ),
-        )
-        conn.commit()
-        logger.info(f"T_ID {details['id']} added to DB with extra details.")
-        return True
-    except sqlite3.Error as e:
-        logger.error(f"DB add_tournament: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                INSERT INTO tournaments (
+                    id, creator_id, name, game, participants, type, status,
+                    tournament_time, penalties, extra_time, conditions, group_chat_id,
+                    num_groups, num_swiss_rounds, current_swiss_round, swiss_knockout_qualifiers
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    details["id"],
+                    details["creator_id"],
+                    details["name"],
+                    details.get("game"),
+                    details.get("participants"),
+                    details.get("type"),
+                    details.get("status"),
+                    details.get("tournament_time"),
+                    details.get("penalties"),
+                    details.get("extra_time"),
+                    details.get("conditions"),
+                    details.get("group_chat_id"),
+                    details.get("num_groups"),
+                    details.get("num_swiss_rounds"),
+                    details.get("current_swiss_round", 0),
+                    details.get("swiss_knockout_qualifiers"),
+                ),
+            )
+            invalidate_tournament_cache(details["id"])
+            logger.info(f"T_ID {details['id']} added to DB with extra details.")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"DB add_tournament: {e}")
+            return False
 
 
 def update_tournament_swiss_round(
-        tournament_id: str, new_round_num: int) -> bool:
-    """Updates the current_swiss_round for a Swiss tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
+        tournament_id: str, new_round_num: int,
+        conn: sqlite3.Connection | None = None) -> bool:
+    """
+    Updates the current_swiss_round for a Swiss tournament.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    if conn is not None:
+        cursor = conn.execute(
             "UPDATE tournaments SET current_swiss_round = ? WHERE id = ?",
             (new_round_num, tournament_id),
         )
-        conn.commit()
         return cursor.rowcount > 0
-    except sqlite3.Error as e:
-        logger.error(
-            f"DB update_tournament_swiss_round for {tournament_id}: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "UPDATE tournaments SET current_swiss_round = ? WHERE id = ?",
+                (new_round_num, tournament_id),
+            )
+            invalidate_tournament_cache(tournament_id)
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(
+                f"DB update_tournament_swiss_round for {tournament_id}: {e}")
+            return False
 
 
 def get_match_history_from_db(
-        user_id: int, page: int = 1, limit: int = 5) -> tuple[list, int]:
-    """Fetches a paginated match history for a player. Returns (matches, total_count)."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-
-    offset = (page - 1) * limit
+        user_id: int, cursor_match_id: int | None = None, limit: int = 5,
+        newer: bool = False) -> tuple[list, bool]:
+    """
+    Fetches one page of a player's completed matches, newest first, using
+    keyset pagination on match_id. Returns (matches, has_more).
 
-    try:
-        # First, get the total count of matches for the player
-        cursor.execute(
-            "SELECT COUNT(*) FROM matches WHERE (player1_user_id = ? OR player2_user_id = ?) AND status = 'completed'",
-            (user_id, user_id)
-        )
-        total_count = cursor.fetchone()['COUNT(*)']
+    Without a cursor this is the newest page. Otherwise it is the page of
+    matches older than cursor_match_id, or newer than it when newer=True;
+    has_more tells whether further rows exist in that direction.
+    """
+    with get_conn() as conn:
+        cursor = conn.cursor()
 
-        # Now, get the paginated results with tournament names
-        cursor.execute("""
+        query = """
             SELECT
-                m.player1_user_id, m.player1_username, m.player2_user_id,
+                m.match_id, m.player1_user_id, m.player1_username, m.player2_user_id,
                 m.player2_username, m.winner_user_id, m.score, m.created_at, t.name as tournament_name
             FROM matches as m
             JOIN tournaments as t ON m.tournament_id = t.id
             WHERE (m.player1_user_id = ? OR m.player2_user_id = ?) AND m.status = 'completed'
-            ORDER BY m.match_id DESC
-            LIMIT ? OFFSET ?;
-        """, (user_id, user_id, limit, offset))
+        """
+        params = [user_id, user_id]
+        if cursor_match_id is not None:
+            query += " AND m.match_id > ?" if newer else " AND m.match_id < ?"
+            params.append(cursor_match_id)
+        query += " ORDER BY m.match_id ASC" if newer else " ORDER BY m.match_id DESC"
+        # Fetch one extra row to learn whether another page exists.
+        query += " LIMIT ?"
+        params.append(limit + 1)
 
-        matches = cursor.fetchall()
-        return matches, total_count
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB error fetching match history for {user_id}: {e}")
+            return [], False
 
-    except sqlite3.Error as e:
-        logger.error(f"DB error fetching match history for {user_id}: {e}")
-        return [], 0
-    finally:
-        conn.close()
+        matches = rows[:limit]
+        if newer:
+            matches.reverse()
+        return matches, len(rows) > limit
 
 
 def get_tournaments_from_db(
@@ -339,191 +611,239 @@ def get_tournaments_from_db(
     Fetches a list of recent tournaments from the database.
     Can be filtered by creator_id and/or group_chat_id.
     """
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    tournaments = []
-    try:
-        query = "SELECT * FROM tournaments"
-        params = []
-        where_clauses = []
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        tournaments = []
+        try:
+            query = "SELECT * FROM tournaments"
+            params = []
+            where_clauses = []
 
-        if creator_id is not None:
-            where_clauses.append("creator_id = ?")
-            params.append(creator_id)
+            if creator_id is not None:
+                where_clauses.append("creator_id = ?")
+                params.append(creator_id)
 
-        if group_chat_id is not None:
-            where_clauses.append("group_chat_id = ?")
-            params.append(group_chat_id)
+            if group_chat_id is not None:
+                where_clauses.append("group_chat_id = ?")
+                params.append(group_chat_id)
 
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
+            if where_clauses:
+                query += " WHERE " + " AND ".join(where_clauses)
 
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
+            query += " ORDER BY created_at DESC LIMIT ?"
+            params.append(limit)
 
-        cursor.execute(query, tuple(params))
-        tournaments = cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_tournaments: {e}")
-    finally:
-        conn.close()
+            cursor.execute(query, tuple(params))
+            tournaments = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_tournaments: {e}")
     return tournaments
 
 
+# Tournament rows rarely change; every write path in this process
+# invalidates them, and the TTL bounds staleness from anything else.
+TOURNAMENT_CACHE_TTL = 30  # seconds
+_TOURNAMENT_CACHE_SIZE = 512
+# tournament_id -> (expiry on the monotonic clock, version, row as a dict or None)
+_tournament_cache: dict[str, tuple[float, tuple[int, int], dict | None]] = {}
+# Invalidation counters per tournament ID; the None key counts clear-alls.
+# Lookups also run in worker threads (run_db), so a row read before an
+# invalidation is only cached if no invalidation happened in between.
+_tournament_version: dict[str | None, int] = defaultdict(int)
+
+
+def invalidate_tournament_cache(tournament_id: str | None = None):
+    """Drops one cached tournament row, or all of them when no ID is given."""
+    _tournament_version[tournament_id] += 1
+    if tournament_id is None:
+        _tournament_cache.clear()
+    else:
+        _tournament_cache.pop(tournament_id, None)
+
+
+def _tournament_cache_version(tournament_id: str) -> tuple[int, int]:
+    """Returns the invalidation counters a cached row of this tournament must match."""
+    return _tournament_version[None], _tournament_version[tournament_id]
+
+
 def get_tournament_details_by_id(tournament_id: str) -> dict | None:
     """Fetches details for a specific tournament by its ID."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT * FROM tournaments WHERE id = ?", (tournament_id,))
-        return cursor.fetchone()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_tournament_details for {tournament_id}: {e}")
-        return None
-    finally:
-        conn.close()
+    now = time.monotonic()
+    version = _tournament_cache_version(tournament_id)
+    cached = _tournament_cache.get(tournament_id)
+    if cached is None or cached[0] <= now or cached[1] != version:
+        try:
+            with get_conn() as conn:
+                row = conn.execute(
+                    "SELECT * FROM tournaments WHERE id = ?", (tournament_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_tournament_details for {tournament_id}: {e}")
+            return None
+        cached = (now + TOURNAMENT_CACHE_TTL, version, dict(row) if row else None)
+        # Don't cache a row that an invalidation may already have superseded
+        if _tournament_cache_version(tournament_id) == version:
+            _tournament_cache.pop(tournament_id, None)
+            if len(_tournament_cache) >= _TOURNAMENT_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                _tournament_cache.pop(next(iter(_tournament_cache), None), None)
+            _tournament_cache[tournament_id] = cached
+    details = cached[2]
+    # Callers read optional fields with .get() and annotate the result, so
+    # hand out a copy rather than the cached dict.
+    return dict(details) if details else None
+
+
+# Creates the leaderboard entry on the first match, otherwise bumps the
+# counters; the stored username is left as it is.
+_GLOBAL_STATS_UPSERT_SQL = """
+    INSERT INTO leaderboard_points (user_id, username, matches_played, match_wins)
+    VALUES (?, ?, 1, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        matches_played = matches_played + 1,
+        match_wins = match_wins + excluded.match_wins
+"""
 
 
 def update_global_stats_for_players(
-        player_id: int, username: str, is_winner: bool):
-    """Updates a player's global match stats after a game."""
+        player_id: int, username: str, is_winner: bool,
+        conn: sqlite3.Connection | None = None):
+    """
+    Updates a player's global match stats after a game.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
     if not player_id:
         return
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        # Ensure the player exists in the leaderboard, otherwise create an
-        # entry
-        cursor.execute(
-            "INSERT OR IGNORE INTO leaderboard_points (user_id, username) VALUES (?, ?)",
-            (player_id, username if username else f"User_{player_id}"),
-        )
-
-        # Now, update their stats
-        win_increment = 1 if is_winner else 0
-        cursor.execute(
-            """
-            UPDATE leaderboard_points
-            SET matches_played = matches_played + 1,
-                match_wins = match_wins + ?
-            WHERE user_id = ?
-            """,
-            (win_increment, player_id),
-        )
-        conn.commit()
-        logger.info(f"Updated global stats for player {player_id}.")
-    except sqlite3.Error as e:
-        logger.error(
-            f"DB error updating global stats for player {player_id}: {e}")
-    finally:
-        conn.close()
+    win_increment = 1 if is_winner else 0
+    params = (player_id, username if username else f"User_{player_id}", win_increment)
+    if conn is not None:
+        conn.execute(_GLOBAL_STATS_UPSERT_SQL, params)
+        return
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(_GLOBAL_STATS_UPSERT_SQL, params)
+            logger.info(f"Updated global stats for player {player_id}.")
+        except sqlite3.Error as e:
+            logger.error(
+                f"DB error updating global stats for player {player_id}: {e}")
 
 
 def add_registration_to_db(
     tournament_id: str, user_id: int, username: str | None
 ) -> bool:
     """Registers a user for a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        display_name = username if username else f"User_{user_id}"
-        cursor.execute(
-            "INSERT INTO registrations (tournament_id, user_id, username) VALUES (?, ?, ?)",
-            (tournament_id, user_id, display_name),
-        )
-        conn.commit()
-        logger.info(
-            f"User {user_id} ({display_name}) registered for T_ID {tournament_id}."
-        )
-        return True
-    except sqlite3.IntegrityError:
-        logger.info(f"User {user_id} already registered for {tournament_id}.")
-        return False
-    except sqlite3.Error as e:
-        logger.error(f"DB add_registration: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            display_name = username if username else f"User_{user_id}"
+            cursor.execute(
+                "INSERT INTO registrations (tournament_id, user_id, username) VALUES (?, ?, ?)",
+                (tournament_id, user_id, display_name),
+            )
+            _get_player_username_cached.cache_clear()
+            logger.info(
+                f"User {user_id} ({display_name}) registered for T_ID {tournament_id}."
+            )
+            return True
+        except sqlite3.IntegrityError:
+            logger.info(f"User {user_id} already registered for {tournament_id}.")
+            return False
+        except sqlite3.Error as e:
+            logger.error(f"DB add_registration: {e}")
+            return False
 
 
 def is_user_registered(tournament_id: str, user_id: int) -> bool:
     """Checks if a user is registered for a specific tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT 1 FROM registrations WHERE tournament_id = ? AND user_id = ?",
-            (tournament_id, user_id),
-        )
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        logger.error(f"DB is_user_registered: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        try:
+            # Answered from the UNIQUE(tournament_id, user_id) covering index.
+            return bool(_scalar(
+                conn,
+                "SELECT EXISTS(SELECT 1 FROM registrations WHERE tournament_id = ? AND user_id = ?)",
+                (tournament_id, user_id),
+            ))
+        except sqlite3.Error as e:
+            logger.error(f"DB is_user_registered: {e}")
+            return False
 
 
 def get_registration_count(tournament_id: str) -> int:
     """Gets the number of registered players for a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT COUNT(*) FROM registrations WHERE tournament_id = ?",
-            (tournament_id,),
-        )
-        return cursor.fetchone()[0]
-    except sqlite3.Error as e:
-        logger.error(f"DB get_registration_count: {e}")
-        return 0
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        try:
+            return _scalar(
+                conn,
+                "SELECT COUNT(*) FROM registrations WHERE tournament_id = ?",
+                (tournament_id,),
+            ) or 0
+        except sqlite3.Error as e:
+            logger.error(f"DB get_registration_count: {e}")
+            return 0
+
+
+def get_registration_counts_for_ids(tournament_ids: list[str]) -> dict[str, int]:
+    """
+    Gets the number of registered players for many tournaments in one
+    query. Tournaments without registrations are left out of the result.
+    """
+    if not tournament_ids:
+        return {}
+    placeholders = ", ".join("?" * len(tournament_ids))
+    with get_conn() as conn:
+        try:
+            return dict(conn.execute(
+                f"""
+                SELECT tournament_id, COUNT(*) FROM registrations
+                WHERE tournament_id IN ({placeholders})
+                GROUP BY tournament_id
+                """,
+                tuple(tournament_ids),
+            ).fetchall())
+        except sqlite3.Error as e:
+            logger.error(f"DB get_registration_counts_for_ids: {e}")
+            return {}
 
 
 def get_registered_players(tournament_id: str) -> list:
     """Gets the list of registered players for a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    players = []
-    try:
-        cursor.execute(
-            "SELECT user_id, username FROM registrations WHERE tournament_id = ?",
-            (tournament_id,),
-        )
-        players = cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_registered_players for {tournament_id}: {e}")
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        players = []
+        try:
+            cursor.execute(
+                "SELECT user_id, username FROM registrations WHERE tournament_id = ?",
+                (tournament_id,),
+            )
+            players = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_registered_players for {tournament_id}: {e}")
     return players
 
 
+@lru_cache(maxsize=1024)
+def _get_player_username_cached(user_id: int) -> str:
+    """Memoized username lookup. Cleared whenever a registration is added."""
+    with get_conn() as conn:
+        result = conn.execute(
+            "SELECT username FROM registrations WHERE user_id = ? AND username IS NOT NULL ORDER BY registration_time DESC LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        return result["username"] if result and result["username"] else f"User_{user_id}"
+
+
 def get_player_username_by_id(user_id: int) -> str | None:
     """Retrieves a player's username by their user ID."""
     if not user_id:
         return "N/A"
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
     try:
-        cursor.execute(
-            "SELECT username FROM registrations WHERE user_id = ? AND username IS NOT NULL ORDER BY registration_time DESC LIMIT 1",
-            (user_id,),
-        )
-        result = cursor.fetchone()
-        return (
-            result["username"] if result and result["username"] else f"User_{user_id}"
-        )
+        return _get_player_username_cached(user_id)
     except sqlite3.Error as e:
         logger.error(f"DB get_player_username_by_id for {user_id}: {e}")
         return f"User_{user_id}"
-    finally:
-        conn.close()
 
 
 def update_tournament_status(
@@ -531,91 +851,143 @@ def update_tournament_status(
     new_status: str,
     winner_user_id: int | None = None,
     winner_username: str | None = None,
+    conn: sqlite3.Connection | None = None,
 ) -> bool:
-    """Updates the status of a tournament, optionally setting a winner."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        if new_status == "completed" and winner_user_id:
-            w_display_name = (
-                winner_username
-                if winner_username
-                else get_player_username_by_id(winner_user_id)
-            )
-            cursor.execute(
-                "UPDATE tournaments SET status = ?, winner_user_id = ?, winner_username = ? WHERE id = ?",
-                (new_status, winner_user_id, w_display_name, tournament_id),
-            )
-        else:
-            cursor.execute(
-                "UPDATE tournaments SET status = ? WHERE id = ?",
-                (new_status, tournament_id),
+    """
+    Updates the status of a tournament, optionally setting a winner.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    if new_status == "completed" and winner_user_id:
+        w_display_name = (
+            winner_username
+            if winner_username
+            else get_player_username_by_id(winner_user_id)
+        )
+        sql = "UPDATE tournaments SET status = ?, winner_user_id = ?, winner_username = ? WHERE id = ?"
+        params = (new_status, winner_user_id, w_display_name, tournament_id)
+    else:
+        sql = "UPDATE tournaments SET status = ? WHERE id = ?"
+        params = (new_status, tournament_id)
+    if conn is not None:
+        return conn.execute(sql, params).rowcount > 0
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            invalidate_tournament_cache(tournament_id)
+            logger.info(
+                f"T_ID {tournament_id} status updated to {new_status}. Winner: {
+                    winner_username if winner_username else 'N/A'}"
             )
-        conn.commit()
-        logger.info(
-            f"T_ID {tournament_id} status updated to {new_status}. Winner: {
-                winner_username if winner_username else 'N/A'}"
-        )
-        return cursor.rowcount > 0
-    except sqlite3.Error as e:
-        logger.error(f"DB update_tournament_status for {tournament_id}: {e}")
-        return False
-    finally:
-        conn.close()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"DB update_tournament_status for {tournament_id}: {e}")
+            return False
+
+
+_INSERT_MATCH_SQL = """
+    INSERT INTO matches (
+        tournament_id, round_number, match_in_round_index,
+        player1_user_id, player1_username,
+        player2_user_id, player2_username,
+        winner_user_id, score, status, next_match_id, group_id,
+        created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _match_insert_params(match_details: dict, created_at: int) -> tuple:
+    """Builds the _INSERT_MATCH_SQL parameter tuple for one match (created_at in epoch seconds)."""
+    return (
+        match_details['tournament_id'], match_details['round_number'], match_details['match_in_round_index'],
+        match_details.get('player1_user_id'), match_details.get('player1_username'),
+        match_details.get('player2_user_id'), match_details.get('player2_username'),
+        match_details.get('winner_user_id'), match_details.get('score'),
+        match_details['status'], match_details.get('next_match_id'), match_details.get('group_id'),
+        created_at,
+    )
 
 
 def add_match_to_db(match_details: dict) -> int | None:
     """Adds a new match to the database, including the creation timestamp."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    with get_write_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            # Get the current time to be inserted explicitly
+            now_epoch = int(datetime.now(timezone.utc).timestamp())
+
+            cursor.execute(
+                _INSERT_MATCH_SQL, _match_insert_params(match_details, now_epoch)
+            )
+            match_id = cursor.lastrowid
+            logger.info(
+                f"Match {match_id} for T_ID {
+                    match_details['tournament_id']} added. Status: {
+                    match_details['status']}.")
+            return match_id
+        except sqlite3.Error as e:
+            logger.error(f"DB add_match: {e} with details {match_details}")
+            return None
+
+
+def _insert_matches(cursor: sqlite3.Cursor, matches: list[dict]) -> list[int]:
+    """Inserts matches with one executemany and returns their IDs in input order."""
+    now_epoch = int(datetime.now(timezone.utc).timestamp())
+    cursor.executemany(
+        _INSERT_MATCH_SQL,
+        [_match_insert_params(m, now_epoch) for m in matches],
+    )
+    # Rows inserted by one statement inside a single write transaction
+    # get consecutive AUTOINCREMENT ids, so the range ends at the last id.
+    last_id = _scalar(cursor.connection, "SELECT last_insert_rowid()")
+    return list(range(last_id - len(matches) + 1, last_id + 1))
+
+
+def add_matches_bulk(
+    matches: list[dict], conn: sqlite3.Connection | None = None
+) -> list[int]:
+    """
+    Adds many matches in one transaction. Returns their IDs in input order.
+    Pass the connection of an open db_tx() to make the insert part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    if not matches:
+        return []
+    if conn is not None:
+        return _insert_matches(conn.cursor(), matches)
     try:
-        # Get the current time to be inserted explicitly
-        now_utc = datetime.now(timezone.utc)
-
-        cursor.execute("""
-            INSERT INTO matches (
-                tournament_id, round_number, match_in_round_index,
-                player1_user_id, player1_username,
-                player2_user_id, player2_username,
-                winner_user_id, score, status, next_match_id, group_id,
-                created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            match_details['tournament_id'], match_details['round_number'], match_details['match_in_round_index'],
-            match_details.get('player1_user_id'), match_details.get(
-                'player1_username'),
-            match_details.get('player2_user_id'), match_details.get(
-                'player2_username'),
-            match_details.get('winner_user_id'), match_details.get('score'),
-            match_details['status'], match_details.get(
-                'next_match_id'), match_details.get('group_id'),
-            now_utc  # Explicitly providing the timestamp
-        ))
-        conn.commit()
-        match_id = cursor.lastrowid
+        with db_tx() as conn:
+            match_ids = _insert_matches(conn.cursor(), matches)
         logger.info(
-            f"Match {match_id} for T_ID {
-                match_details['tournament_id']} added. Status: {
-                match_details['status']}.")
-        return match_id
+            f"{len(match_ids)} matches for T_ID {
+                matches[0]['tournament_id']} added (IDs {
+                match_ids[0]}-{match_ids[-1]}).")
+        return match_ids
     except sqlite3.Error as e:
-        logger.error(f"DB add_match: {e} with details {match_details}")
-        return None
-    finally:
-        conn.close()
+        logger.error(f"DB add_matches_bulk: {e}")
+        return []
 
 
-def get_matches_for_tournament(
+@db_op(default=False)
+def link_next_matches(links: list[tuple[int, int]]) -> bool:
+    """Points each (next_match_id, match_id) pair's match at its next match in one transaction."""
+    if not links:
+        return True
+    with db_tx() as conn:
+        conn.executemany(
+            "UPDATE matches SET next_match_id = ? WHERE match_id = ?", links
+        )
+    return True
+
+
+def _matches_for_tournament_query(
     tournament_id: str,
-    match_status: str | None = None,
-    round_number: int | None = None,
-    group_id: int | None = None,
-) -> list:
-    """Fetches matches for a given tournament, with optional status, round, and group filters."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    matches_list = []
+    match_status: str | None,
+    round_number: int | None,
+    group_id: int | None,
+) -> tuple[str, tuple]:
+    """Builds the filtered matches query used by get_matches_for_tournament."""
     query = "SELECT * FROM matches WHERE tournament_id = ?"
     params = [tournament_id]
     if match_status:
@@ -630,32 +1002,85 @@ def get_matches_for_tournament(
     elif group_id is None:  # For non-group matches (SE, Swiss, KO)
         query += " AND group_id IS NULL"
     query += " ORDER BY round_number, match_in_round_index"
-    try:
-        cursor.execute(query, tuple(params))
-        matches_list = cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_matches_for_tournament {tournament_id}: {e}")
-    finally:
-        conn.close()
+    return query, tuple(params)
+
+
+def get_matches_for_tournament(
+    tournament_id: str,
+    match_status: str | None = None,
+    round_number: int | None = None,
+    group_id: int | None = None,
+) -> list:
+    """Fetches matches for a given tournament, with optional status, round, and group filters."""
+    query, params = _matches_for_tournament_query(
+        tournament_id, match_status, round_number, group_id)
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        matches_list = []
+        try:
+            cursor.execute(query, params)
+            matches_list = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_matches_for_tournament {tournament_id}: {e}")
     return matches_list
 
 
-def get_match_details_by_match_id(match_id: int) -> dict | None:
+_SCHEDULED_MATCH_IN_ROUND_SQL = """
+    SELECT EXISTS(
+        SELECT 1 FROM matches
+        WHERE tournament_id = ? AND status = 'scheduled'
+          AND round_number = ? AND group_id IS NULL
+    )
+"""
+
+
+def any_scheduled_match_in_round(tournament_id: str, round_number: int) -> bool:
+    """Returns whether a non-group match of the round is still scheduled."""
+    with get_conn() as conn:
+        try:
+            return bool(_scalar(
+                conn, _SCHEDULED_MATCH_IN_ROUND_SQL, (tournament_id, round_number)))
+        except sqlite3.Error as e:
+            logger.error(f"DB any_scheduled_match_in_round {tournament_id}: {e}")
+            return False
+
+
+def get_scheduled_non_group_rounds(tournament_ids: list[str]) -> set[tuple[str, int]]:
+    """
+    Returns the (tournament_id, round_number) pairs that still have a
+    scheduled non-group match, for many tournaments in one query.
+    """
+    if not tournament_ids:
+        return set()
+    placeholders = ", ".join("?" * len(tournament_ids))
+    with get_conn() as conn:
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT DISTINCT tournament_id, round_number FROM matches
+                WHERE tournament_id IN ({placeholders})
+                  AND status = 'scheduled' AND group_id IS NULL
+                """,
+                tuple(tournament_ids),
+            ).fetchall()
+            return {tuple(row) for row in rows}
+        except sqlite3.Error as e:
+            logger.error(f"DB get_scheduled_non_group_rounds: {e}")
+            return set()
+
+
+def get_match_details_by_match_id(match_id: int) -> sqlite3.Row | None:
     """Fetches details for a specific match by its ID."""
     if match_id is None:
         return None
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT * FROM matches WHERE match_id = ?", (match_id,))
-        match = cursor.fetchone()
-        return match
-    except sqlite3.Error as e:
-        logger.error(f"Database error while fetching match {match_id}: {e}")
-        return None
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        try:
+            return conn.execute(
+                "SELECT * FROM matches WHERE match_id = ?", (match_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Database error while fetching match {match_id}: {e}")
+            return None
 
 
 # A dictionary defining all possible achievements
@@ -668,114 +1093,128 @@ ACHIEVEMENTS = {
 }
 
 
-def award_achievement(user_id: int, achievement_code: str, tournament_id: str | None = None, description: str | None = None):
+def award_achievement(user_id: int, achievement_code: str, tournament_id: str | None = None, description: str | None = None,
+                      conn: sqlite3.Connection | None = None):
     """Awards a player an achievement. Now supports custom descriptions."""
-    if achievement_code not in ACHIEVEMENTS and achievement_code != 'CUSTOM':
-        return
+    award_achievements_bulk(
+        [(user_id, achievement_code, tournament_id, description)], conn=conn)
 
-    # For automatic achievements, get the description from our dictionary
-    if not description and achievement_code in ACHIEVEMENTS:
-        description = ACHIEVEMENTS[achievement_code]
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+_AWARD_ACHIEVEMENT_SQL = "INSERT INTO player_achievements (user_id, achievement_code, description, tournament_id) VALUES (?, ?, ?, ?)"
+
+
+def award_achievements_bulk(
+        items: list[tuple[int, str, str | None, str | None]],
+        conn: sqlite3.Connection | None = None):
+    """
+    Awards several achievements with one executemany. Each item is
+    (user_id, achievement_code, tournament_id, description); unknown codes
+    are skipped and missing descriptions come from ACHIEVEMENTS.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    rows = []
+    for user_id, achievement_code, tournament_id, description in items:
+        if achievement_code not in ACHIEVEMENTS and achievement_code != 'CUSTOM':
+            continue
+        # For automatic achievements, get the description from our dictionary
+        if not description and achievement_code in ACHIEVEMENTS:
+            description = ACHIEVEMENTS[achievement_code]
+        rows.append((user_id, achievement_code, description, tournament_id))
+    if not rows:
+        return
+
+    if conn is not None:
+        conn.executemany(_AWARD_ACHIEVEMENT_SQL, rows)
+        return
     try:
-        # We no longer use IGNORE because a player can have multiple CUSTOM badges
-        cursor.execute(
-            "INSERT INTO player_achievements (user_id, achievement_code, description, tournament_id) VALUES (?, ?, ?, ?)",
-            (user_id, achievement_code, description, tournament_id)
-        )
-        conn.commit()
-        if cursor.rowcount > 0:
+        with db_tx() as conn:
+            # We no longer use IGNORE because a player can have multiple CUSTOM badges
+            conn.executemany(_AWARD_ACHIEVEMENT_SQL, rows)
+        for user_id, _, description, _ in rows:
             logger.info(f"Awarded achievement '{description}' to user {user_id}")
     except sqlite3.Error as e:
         logger.error(f"DB award_achievement failed: {e}")
-    finally:
-        conn.close()
+
 
 def get_player_achievements(user_id: int) -> list:
     """Gets a list of all achievements (dictionaries) earned by a player."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        # Fetch the description as well
-        cursor.execute("SELECT description FROM player_achievements WHERE user_id = ?", (user_id,))
-        return [row['description'] for row in cursor.fetchall()]
-    except sqlite3.Error:
-        return []
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            # Fetch the description as well
+            cursor.execute("SELECT description FROM player_achievements WHERE user_id = ?", (user_id,))
+            return [row['description'] for row in cursor.fetchall()]
+        except sqlite3.Error:
+            return []
 
 
 def get_h2h_stats_from_db(user1_id: int, user2_id: int) -> dict | None:
     """Fetches head-to-head match statistics between two players, now handling walkovers."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
+    with get_conn() as conn:
+        cursor = conn.cursor()
     
-    stats = {
-        'user1_wins': 0,
-        'user2_wins': 0,
-        'draws': 0,
-        'recent_matches': []
-    }
+        stats = {
+            'user1_wins': 0,
+            'user2_wins': 0,
+            'draws': 0,
+            'recent_matches': []
+        }
     
-    try:
-        cursor.execute("""
-            SELECT winner_user_id, player1_user_id, score, tournament_id
-            FROM matches
-            WHERE
-                status = 'completed' AND
-                (
-                    (player1_user_id = ? AND player2_user_id = ?) OR
-                    (player1_user_id = ? AND player2_user_id = ?)
-                )
-            ORDER BY match_id DESC
-        """, (user1_id, user2_id, user2_id, user1_id))
+        try:
+            cursor.execute("""
+                SELECT m.winner_user_id, m.player1_user_id, m.score,
+                       m.tournament_id, t.name AS tournament_name
+                FROM matches AS m
+                LEFT JOIN tournaments AS t ON t.id = m.tournament_id
+                WHERE
+                    m.status = 'completed' AND
+                    (
+                        (m.player1_user_id = ? AND m.player2_user_id = ?) OR
+                        (m.player1_user_id = ? AND m.player2_user_id = ?)
+                    )
+                ORDER BY m.match_id DESC
+            """, (user1_id, user2_id, user2_id, user1_id))
         
-        all_matches = cursor.fetchall()
+            all_matches = cursor.fetchall()
         
-        if not all_matches:
-            return None # Return None if they've never played
-
-        # Process the stats
-        for match in all_matches:
-            if match['winner_user_id'] == user1_id:
-                stats['user1_wins'] += 1
-            elif match['winner_user_id'] == user2_id:
-                stats['user2_wins'] += 1
-            elif match['winner_user_id'] is None:
-                stats['draws'] += 1
-
-            # Get last 3 recent matches
-            if len(stats['recent_matches']) < 3:
-                original_score = match.get('score', 'N/A')
-
-                # --- NEW: Safely determine score from user1's perspective ---
-                final_score = original_score
-                if match['player1_user_id'] != user1_id:
-                    try:
-                        # Try to reverse the score, e.g., "1-2" -> "2-1"
-                        p2_score, p1_score = original_score.split('-')
-                        final_score = f"{p1_score}-{p2_score}"
-                    except (ValueError, AttributeError):
-                        # This will catch "W/O" or other non-standard scores and leave them as is
-                        final_score = original_score
-                # --- END OF NEW LOGIC ---
+            if not all_matches:
+                return None # Return None if they've never played
+
+            # Process the stats
+            for match in all_matches:
+                if match['winner_user_id'] == user1_id:
+                    stats['user1_wins'] += 1
+                elif match['winner_user_id'] == user2_id:
+                    stats['user2_wins'] += 1
+                elif match['winner_user_id'] is None:
+                    stats['draws'] += 1
+
+                # Get last 3 recent matches
+                if len(stats['recent_matches']) < 3:
+                    original_score = match['score'] if match['score'] is not None else 'N/A'
+
+                    # --- NEW: Safely determine score from user1's perspective ---
+                    final_score = original_score
+                    if match['player1_user_id'] != user1_id:
+                        try:
+                            # Try to reverse the score, e.g., "1-2" -> "2-1"
+                            p2_score, p1_score = original_score.split('-')
+                            final_score = f"{p1_score}-{p2_score}"
+                        except (ValueError, AttributeError):
+                            # This will catch "W/O" or other non-standard scores and leave them as is
+                            final_score = original_score
+                    # --- END OF NEW LOGIC ---
                 
-                t_details = get_tournament_details_by_id(match['tournament_id'])
-                t_name = t_details['name'] if t_details else 'a tournament'
+                    t_name = match['tournament_name'] or 'a tournament'
                 
-                stats['recent_matches'].append({'tournament_name': t_name, 'score': final_score})
+                    stats['recent_matches'].append({'tournament_name': t_name, 'score': final_score})
 
-        return stats
+            return stats
         
-    except sqlite3.Error as e:
-        logger.error(f"DB error fetching H2H stats for {user1_id} vs {user2_id}: {e}")
-        return {}
-    finally:
-        conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"DB error fetching H2H stats for {user1_id} vs {user2_id}: {e}")
+            return {}
 
 
 def get_player_stats_from_db(user_id: int) -> dict | None:
@@ -783,279 +1222,276 @@ def get_player_stats_from_db(user_id: int) -> dict | None:
     Fetches and computes all relevant stats for a given player ID.
     Returns a dictionary with stats or None if player not found.
     """
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    stats = {}
-
-    try:
-        # Check if player exists
-        cursor.execute(
-            "SELECT 1 FROM registrations WHERE user_id = ?", (user_id,))
-        if cursor.fetchone() is None:
-            return None  # Player has never registered for any tournament
-
-        # 1. Tournaments Won
-        cursor.execute(
-            "SELECT COUNT(*) FROM tournaments WHERE winner_user_id = ?", (user_id,)
-        )
-        stats["tournaments_won"] = cursor.fetchone()[0]
-
-        # 2. Tournaments Played
-        cursor.execute(
-            "SELECT COUNT(DISTINCT tournament_id) FROM registrations WHERE user_id = ?",
-            (user_id,),
-        )
-        stats["tournaments_played"] = cursor.fetchone()[0]
-
-        # 3. Matches Played
-        cursor.execute(
-            "SELECT COUNT(*) FROM matches WHERE (player1_user_id = ? OR player2_user_id = ?) AND status = 'completed'",
-            (user_id, user_id),
-        )
-        stats["matches_played"] = cursor.fetchone()[0]
-
-        # 4. Matches Won
-        cursor.execute(
-            "SELECT COUNT(*) FROM matches WHERE winner_user_id = ? AND status = 'completed'",
-            (user_id,),
-        )
-        stats["matches_won"] = cursor.fetchone()[0]
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        stats = {}
 
-        # 5. Compute derived stats
-        stats["matches_lost"] = stats["matches_played"] - stats["matches_won"]
-        if stats["matches_played"] > 0:
-            stats["win_rate"] = (
-                stats["matches_won"] / stats["matches_played"]) * 100
-        else:
-            stats["win_rate"] = 0
-        stats['achievements'] = get_player_achievements(user_id)
+        try:
+            # One round-trip: existence probe plus all four counters
+            cursor.execute(
+                """
+                SELECT
+                    EXISTS (SELECT 1 FROM registrations WHERE user_id = :uid),
+                    (SELECT COUNT(*) FROM tournaments WHERE winner_user_id = :uid),
+                    (SELECT COUNT(DISTINCT tournament_id) FROM registrations WHERE user_id = :uid),
+                    (SELECT COUNT(*) FROM matches
+                     WHERE (player1_user_id = :uid OR player2_user_id = :uid) AND status = 'completed'),
+                    (SELECT COUNT(*) FROM matches WHERE winner_user_id = :uid AND status = 'completed')
+                """,
+                {"uid": user_id},
+            )
+            (
+                is_registered,
+                stats["tournaments_won"],
+                stats["tournaments_played"],
+                stats["matches_played"],
+                stats["matches_won"],
+            ) = cursor.fetchone()
+            if not is_registered:
+                return None  # Player has never registered for any tournament
+
+            # Compute derived stats
+            stats["matches_lost"] = stats["matches_played"] - stats["matches_won"]
+            if stats["matches_played"] > 0:
+                stats["win_rate"] = (
+                    stats["matches_won"] / stats["matches_played"]) * 100
+            else:
+                stats["win_rate"] = 0
+            stats['achievements'] = get_player_achievements(user_id)
 
-        return stats
+            return stats
 
-    except sqlite3.Error as e:
-        logger.error(f"DB error fetching stats for player {user_id}: {e}")
-        return {}  # Return empty dict on error
-    finally:
-        conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"DB error fetching stats for player {user_id}: {e}")
+            return {}  # Return empty dict on error
 
 
-def get_final_match_details(tournament_id: str) -> dict | None:
+def get_final_match_details(tournament_id: str) -> sqlite3.Row | None:
     """Fetches the details of the final completed match for a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        # For Single Elim/Knockout, the final match is the one with no
-        # next_match_id
-        cursor.execute(
-            """
-            SELECT * FROM matches
-            WHERE tournament_id = ? AND status = 'completed' AND next_match_id IS NULL
-            ORDER BY round_number DESC, match_in_round_index DESC LIMIT 1
-        """,
-            (tournament_id,),
-        )
-        final_match = cursor.fetchone()
-        if (
-            not final_match
-        ):  # Fallback if next_match_id logic wasn't perfect or for other types
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            # For Single Elim/Knockout, the final match is the one with no
+            # next_match_id
             cursor.execute(
                 """
                 SELECT * FROM matches
-                WHERE tournament_id = ? AND status = 'completed'
-                ORDER BY round_number DESC, match_id DESC LIMIT 1
+                WHERE tournament_id = ? AND status = 'completed' AND next_match_id IS NULL
+                ORDER BY round_number DESC, match_in_round_index DESC LIMIT 1
             """,
                 (tournament_id,),
             )
             final_match = cursor.fetchone()
-        return final_match
-    except sqlite3.Error as e:
-        logger.error(
-            f"DB get_final_match_details for T_ID {tournament_id}: {e}")
-        return None
-    finally:
-        conn.close()
+            if (
+                not final_match
+            ):  # Fallback if next_match_id logic wasn't perfect or for other types
+                cursor.execute(
+                    """
+                    SELECT * FROM matches
+                    WHERE tournament_id = ? AND status = 'completed'
+                    ORDER BY round_number DESC, match_id DESC LIMIT 1
+                """,
+                    (tournament_id,),
+                )
+                final_match = cursor.fetchone()
+            return final_match
+        except sqlite3.Error as e:
+            logger.error(
+                f"DB get_final_match_details for T_ID {tournament_id}: {e}")
+            return None
+
+
+_MATCHES_WON_BY_PLAYER_SQL = """
+    SELECT * FROM matches
+    WHERE tournament_id = ? AND winner_user_id = ? AND status = 'completed' AND player1_user_id IS NOT NULL AND player2_user_id IS NOT NULL
+    ORDER BY round_number ASC
+"""
 
 
 def get_matches_won_by_player(tournament_id: str, player_id: int) -> list:
     """Fetches all matches won by a specific player in a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    matches_won = []
-    try:
-        cursor.execute(
-            """
-            SELECT * FROM matches
-            WHERE tournament_id = ? AND winner_user_id = ? AND status = 'completed' AND player1_user_id IS NOT NULL AND player2_user_id IS NOT NULL
-            ORDER BY round_number ASC
-        """,
-            (tournament_id, player_id),
-        )
-        matches_won = cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(
-            f"DB get_matches_won_by_player for T_ID {tournament_id}, P_ID {player_id}: {e}"
-        )
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        matches_won = []
+        try:
+            cursor.execute(
+                _MATCHES_WON_BY_PLAYER_SQL, (tournament_id, player_id))
+            matches_won = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(
+                f"DB get_matches_won_by_player for T_ID {tournament_id}, P_ID {player_id}: {e}"
+            )
     return matches_won
 
 
-def update_leaderboard(
-    winner_user_id: int, winner_username: str, points_to_add: int = 1
-):
-    """Updates the global leaderboard with points for a winner."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        current_display_name = winner_username
-        if not current_display_name:
-            current_display_name = get_player_username_by_id(winner_user_id)
-        if not current_display_name:
-            current_display_name = f"User_{winner_user_id}"
+# Creates the row on a player's first win, otherwise adds to it
+_LEADERBOARD_WIN_UPSERT_SQL = """
+    INSERT INTO leaderboard_points (user_id, username, points, wins, last_win_timestamp)
+    VALUES (?, ?, ?, 1, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        points = COALESCE(points, 0) + excluded.points,
+        wins = COALESCE(wins, 0) + 1,
+        username = excluded.username,
+        last_win_timestamp = excluded.last_win_timestamp
+"""
 
-        now_utc = datetime.now(timezone.utc)
-
-        original_row_factory = conn.row_factory
-        conn.row_factory = (
-            None  # Temporarily disable row_factory for fetchone to get a tuple
-        )
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT points, wins FROM leaderboard_points WHERE user_id = ?",
-            (winner_user_id,),
-        )
-        data_tuple = cursor.fetchone()
-        conn.row_factory = original_row_factory  # Restore row_factory
-
-        if data_tuple:
-            current_points = data_tuple[0] if data_tuple[0] is not None else 0
-            current_wins = data_tuple[1] if data_tuple[1] is not None else 0
-            new_points = current_points + points_to_add
-            new_wins = current_wins + 1
-            cursor.execute(
-                """
-                UPDATE leaderboard_points
-                SET points = ?, wins = ?, username = ?, last_win_timestamp = ?
-                WHERE user_id = ?
-            """,
-                (new_points, new_wins, current_display_name, now_utc, winner_user_id),
-            )
-            logger.info(
-                f"Leaderboard updated for user {winner_user_id} ({current_display_name}): {new_points} points, {new_wins} wins."
-            )
-        else:
-            cursor.execute(
-                """
-                INSERT INTO leaderboard_points (user_id, username, points, wins, last_win_timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (winner_user_id, current_display_name, points_to_add, 1, now_utc),
-            )
-            logger.info(
-                f"User {winner_user_id} ({current_display_name}) added to leaderboard: {points_to_add} points, 1 win."
-            )
-        conn.commit()
+
+def update_leaderboard(
+    winner_user_id: int,
+    winner_username: str,
+    points_to_add: int = 1,
+    conn: sqlite3.Connection | None = None,
+):
+    """
+    Updates the global leaderboard with points for a winner.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    current_display_name = winner_username
+    if not current_display_name:
+        current_display_name = get_player_username_by_id(winner_user_id)
+    if not current_display_name:
+        current_display_name = f"User_{winner_user_id}"
+
+    now_ms = int(time.time() * 1000)
+    params = (winner_user_id, current_display_name, points_to_add, now_ms)
+    if conn is not None:
+        conn.execute(_LEADERBOARD_WIN_UPSERT_SQL, params)
+        return
+    try:
+        with get_write_conn() as conn:
+            conn.execute(_LEADERBOARD_WIN_UPSERT_SQL, params)
+        logger.info(
+            f"Leaderboard updated for user {winner_user_id} ({current_display_name}): +{points_to_add} points, +1 win."
+        )
     except sqlite3.Error as e:
         logger.error(
             f"DB error in update_leaderboard for user {winner_user_id}: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+
+
+_ROUND_ROBIN_STANDINGS_UPSERT_SQL = """
+    INSERT INTO round_robin_standings (
+        tournament_id, user_id, username, games_played,
+        wins, draws, losses, goals_for, goals_against, points
+    ) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tournament_id, user_id) DO UPDATE SET
+        games_played = games_played + 1,
+        wins = wins + excluded.wins,
+        draws = draws + excluded.draws,
+        losses = losses + excluded.losses,
+        goals_for = goals_for + excluded.goals_for,
+        goals_against = goals_against + excluded.goals_against,
+        points = points + excluded.points
+"""
 
 
 def update_round_robin_player_stats(
-    tournament_id: str, user_id: int, username: str, goals_for: int, goals_against: int
+    tournament_id: str,
+    user_id: int,
+    username: str,
+    goals_for: int,
+    goals_against: int,
+    conn: sqlite3.Connection | None = None,
 ):
-    """Updates a player's statistics in the round_robin_standings table."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO round_robin_standings (tournament_id, user_id, username)
-            VALUES (?, ?, ?)
-        """,
-            (tournament_id, user_id, username),
-        )
-
-        wins = 0
-        draws = 0
-        losses = 0
-        points_earned = 0
-        if goals_for > goals_against:
-            wins = 1
-            points_earned = POINTS_FOR_WIN
-        elif goals_for == goals_against:
-            draws = 1
-            points_earned = POINTS_FOR_DRAW
-        else:
-            losses = 1
-            points_earned = POINTS_FOR_LOSS
-
-        goal_difference = goals_for - goals_against
+    """
+    Updates a player's statistics in the round_robin_standings table.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    wins = 0
+    draws = 0
+    losses = 0
+    points_earned = 0
+    if goals_for > goals_against:
+        wins = 1
+        points_earned = POINTS_FOR_WIN
+    elif goals_for == goals_against:
+        draws = 1
+        points_earned = POINTS_FOR_DRAW
+    else:
+        losses = 1
+        points_earned = POINTS_FOR_LOSS
 
-        cursor.execute(
-            """
-            UPDATE round_robin_standings
-            SET
-                games_played = games_played + 1,
-                wins = wins + ?,
-                draws = draws + ?,
-                losses = losses + ?,
-                goals_for = goals_for + ?,
-                goals_against = goals_against + ?,
-                goal_difference = goal_difference + ?,
-                points = points + ?
-            WHERE tournament_id = ? AND user_id = ?
-        """,
-            (
-                wins,
-                draws,
-                losses,
-                goals_for,
-                goals_against,
-                goal_difference,
-                points_earned,
-                tournament_id,
-                user_id,
-            ),
-        )
-        conn.commit()
-        logger.info(
-            f"Updated RR standings for user {user_id} in T_ID {tournament_id}.")
+    params = (
+        tournament_id,
+        user_id,
+        username,
+        wins,
+        draws,
+        losses,
+        goals_for,
+        goals_against,
+        points_earned,
+    )
+    if conn is not None:
+        conn.execute(_ROUND_ROBIN_STANDINGS_UPSERT_SQL, params)
+        return
+    try:
+        with get_write_conn() as conn:
+            # Creates the standings row on the first result, otherwise adds to it
+            conn.execute(_ROUND_ROBIN_STANDINGS_UPSERT_SQL, params)
+            logger.info(
+                f"Updated RR standings for user {user_id} in T_ID {tournament_id}.")
+        invalidate_standings(tournament_id)
     except sqlite3.Error as e:
         logger.error(
             f"DB error updating RR standings for user {user_id} in T_ID {tournament_id}: {e}"
         )
-        conn.rollback()
-    finally:
-        conn.close()
+
+
+_ROUND_ROBIN_STANDINGS_SQL = """
+    SELECT username, user_id, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
+    FROM round_robin_standings
+    WHERE tournament_id = ?
+    ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
+"""
+_GROUP_STAGE_STANDINGS_SQL = """
+    SELECT username, user_id, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
+    FROM group_stage_standings
+    WHERE tournament_id = ? AND group_id = ?
+    ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
+"""
+_STANDINGS_CACHE_SIZE = 512
+# Keyed by (tournament_id, group_id); group_id is None for Round Robin and
+# Swiss standings. A cached entry is only used while its version is current.
+_standings_cache: dict[tuple, tuple[int, list[dict]]] = {}
+_standings_version: dict[tuple, int] = defaultdict(int)
+
+
+def invalidate_standings(tournament_id: str, group_id: int | None = None):
+    """Marks the cached standings of a tournament (or one of its groups) stale."""
+    _standings_version[(tournament_id, group_id)] += 1
+
+
+def _cached_standings(key: tuple, sql: str, params: tuple) -> list[dict]:
+    """Returns copies of the cached standings rows, re-querying when stale."""
+    version = _standings_version[key]
+    cached = _standings_cache.get(key)
+    if cached is None or cached[0] != version:
+        with get_conn() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        _standings_cache.pop(key, None)
+        if len(_standings_cache) >= _STANDINGS_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            _standings_cache.pop(next(iter(_standings_cache), None), None)
+        cached = _standings_cache[key] = (version, rows)
+    return [dict(row) for row in cached[1]]
 
 
 def get_round_robin_standings(tournament_id: str) -> list:
     """Fetches standings for a Round Robin or Swiss tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
     try:
-        cursor.execute(
-            """
-            SELECT username, user_id, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
-            FROM round_robin_standings
-            WHERE tournament_id = ?
-            ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
-        """,
-            (tournament_id,),
+        return _cached_standings(
+            (tournament_id, None), _ROUND_ROBIN_STANDINGS_SQL, (tournament_id,)
         )
-        return cursor.fetchall()
     except sqlite3.Error as e:
         logger.error(
             f"DB get_round_robin_standings for T_ID {tournament_id}: {e}")
         return []
-    finally:
-        conn.close()
+
+
+# Dummy opponent that pads an odd round robin field; never stored or mutated
+_BYE = {"user_id": None, "username": "BYE"}
 
 
 def generate_round_robin_fixtures(players: list) -> list:
@@ -1065,133 +1501,118 @@ def generate_round_robin_fixtures(players: list) -> list:
     Returns a list of rounds, where each round is a list of matches.
     Each match is a tuple: (player1_data, player2_data).
     """
-    n = len(players)
-    if n % 2 != 0:
+    # Work on a copy so the caller's player list is not padded with the BYE
+    pairs = list(players)
+    if len(pairs) % 2 != 0:
         # Add a dummy player for odd number of players
-        players.append({"user_id": None, "username": "BYE"})
-        n += 1  # Update n to be even
+        pairs.append(_BYE)
+    n = len(pairs)
+    half = n // 2
+    if n == 0:
+        return []
+    # The first player stays fixed while the others rotate around it
+    anchor = pairs[0]
+    rest = deque(pairs[1:])
 
+    # Number of rounds = n - 1; pair i-th from the front with i-th from the back
     schedule = []
-    # Create pairs of players
-    pairs = list(players)
+    for _ in range(n - 1):
+        circle = list(rest)
+        # A player drawn against the BYE dummy sits the round out, so that
+        # pairing is never emitted
+        round_matches = [
+            (p1, p2)
+            for p1, p2 in zip(
+                [anchor] + circle[: half - 1], reversed(circle[half - 1:])
+            )
+            if p1["user_id"] is not None and p2["user_id"] is not None
+        ]
+        if round_matches:  # Only add rounds that actually have matches
+            schedule.append(round_matches)
+        rest.rotate(1)
+    return schedule
 
-    # Number of rounds = n - 1
-    for i in range(n - 1):
-        round_matches = []
-        # Pair first player with the last one
-        round_matches.append((pairs[0], pairs[n - 1]))
-
-        # Pair remaining players
-        for j in range(1, n // 2):
-            round_matches.append((pairs[j], pairs[n - 1 - j]))
-        schedule.append(round_matches)
-
-        # Rotate players: keep first player fixed, rotate others
-        temp = pairs[n - 1]
-        for j in range(n - 1, 1, -1):
-            pairs[j] = pairs[j - 1]
-        pairs[1] = temp
-
-    # If an odd number of actual players, remove BYE matches from schedule
-    final_schedule = []
-    for round_matches in schedule:
-        current_round_actual_matches = []
-        for p1, p2 in round_matches:
-            # Only include matches where neither player is the BYE dummy
-            if p1["user_id"] is not None and p2["user_id"] is not None:
-                current_round_actual_matches.append((p1, p2))
-            # If one player is BYE, the other gets a bye in this round, so no
-            # match is played.
-        if current_round_actual_matches:  # Only add rounds that actually have matches
-            final_schedule.append(current_round_actual_matches)
-    return final_schedule
+
+_PLAYER_MATCHES_SQL = """
+    SELECT player1_user_id, player2_user_id
+    FROM matches
+    WHERE tournament_id = ? AND (player1_user_id = ? OR player2_user_id = ?) AND status = 'completed'
+"""
 
 
 def get_player_matches(tournament_id: str, user_id: int) -> list:
     """Fetches all matches a player has participated in for a given tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            SELECT player1_user_id, player2_user_id
-            FROM matches
-            WHERE tournament_id = ? AND (player1_user_id = ? OR player2_user_id = ?) AND status = 'completed'
-        """,
-            (tournament_id, user_id, user_id),
-        )
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(
-            f"DB get_player_matches for T_ID {tournament_id}, P_ID {user_id}: {e}"
-        )
-        return []
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                _PLAYER_MATCHES_SQL, (tournament_id, user_id, user_id))
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(
+                f"DB get_player_matches for T_ID {tournament_id}, P_ID {user_id}: {e}"
+            )
+            return []
+
+
+def played_pairs(matches: list) -> frozenset:
+    """Returns the unordered player pairings of a list of matches as a set."""
+    return frozenset(
+        frozenset((match["player1_user_id"], match["player2_user_id"]))
+        for match in matches
+    )
 
 
 def has_played_against(
     player1_id: int, player2_id: int, existing_matches: list
 ) -> bool:
     """Checks if two players have already played against each other based on a list of matches."""
-    for match in existing_matches:
-        if (
-            match["player1_user_id"] == player1_id
-            and match["player2_user_id"] == player2_id
-        ) or (
-            match["player1_user_id"] == player2_id
-            and match["player2_user_id"] == player1_id
-        ):  # Corrected this line
-            return True
-    return False
+    return frozenset((player1_id, player2_id)) in played_pairs(existing_matches)
+
+
+def get_swiss_pairing_order(tournament_id: str, registered_players: list) -> list:
+    """
+    Returns every player to pair in a Swiss round, strongest first: the
+    standings rows plus any registered player without one yet (on 0 points).
+    Ties on points, goal difference and goals for fall back to username,
+    descending.
+    """
+    # Registered players are passed in as a VALUES table; "(NULL, NULL)"
+    # keeps the CTE valid when the list is empty and never matches a row.
+    values_sql = ", ".join(["(?, ?)"] * len(registered_players)) or "(NULL, NULL)"
+    params = [
+        value for p in registered_players for value in (p["user_id"], p["username"])
+    ]
+    try:
+        with get_conn() as conn:
+            rows = conn.execute(
+                f"""
+                WITH reg(user_id, username) AS (VALUES {values_sql})
+                SELECT user_id, username, points, goal_difference, goals_for
+                FROM round_robin_standings
+                WHERE tournament_id = ?
+                UNION ALL
+                SELECT user_id, username, 0, 0, 0
+                FROM reg
+                WHERE user_id IS NOT NULL AND user_id NOT IN (
+                    SELECT user_id FROM round_robin_standings WHERE tournament_id = ?
+                )
+                ORDER BY points DESC, goal_difference DESC, goals_for DESC, username DESC
+            """,
+                (*params, tournament_id, tournament_id),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.error(
+            f"DB get_swiss_pairing_order for T_ID {tournament_id}: {e}")
+        return []
+    return [{"user_id": row["user_id"], "username": row["username"]} for row in rows]
 
 
 def generate_swiss_round_matches(
     tournament_id: str, round_number: int, registered_players: list
 ) -> list:
     """Generates matches for a Swiss tournament round."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-
-    # Get current standings to sort players
-    standings = get_round_robin_standings(tournament_id)
-    # Ensure all registered players are in standings, even if they have 0
-    # points
-    standing_player_ids = {s["user_id"] for s in standings}
-    for player in registered_players:
-        if player["user_id"] not in standing_player_ids:
-            standings.append(
-                {
-                    "user_id": player["user_id"],
-                    "username": player["username"],
-                    "games_played": 0,
-                    "wins": 0,
-                    "draws": 0,
-                    "losses": 0,
-                    "goals_for": 0,
-                    "goals_against": 0,
-                    "goal_difference": 0,
-                    "points": 0,
-                }
-            )
-
-    # Sort players by points, then goal difference, then goals for, then
-    # username
-    standings.sort(
-        key=lambda x: (
-            x["points"],
-            x["goal_difference"],
-            x["goals_for"],
-            x["username"],
-        ),
-        reverse=True,
-    )
-
-    players_to_pair = [
-        {"user_id": s["user_id"], "username": s["username"]} for s in standings
-    ]
+    players_to_pair = get_swiss_pairing_order(tournament_id, registered_players)
     matches_for_round = []
     paired_players_ids = set()
 
@@ -1199,14 +1620,15 @@ def generate_swiss_round_matches(
     all_previous_matches = get_matches_for_tournament(
         tournament_id, match_status="completed", group_id=None
     )  # Only consider completed matches for rematch history
+    played = played_pairs(all_previous_matches)
 
     match_in_round_idx = 0
 
-    # Create a mutable copy of players_to_pair for easier removal
-    unpaired_players = list(players_to_pair)
+    # Queue of players still to pair; the top player is taken from the left
+    unpaired_players = deque(players_to_pair)
 
     while unpaired_players:
-        p1 = unpaired_players.pop(0)  # Take the top available player
+        p1 = unpaired_players.popleft()  # Take the top available player
 
         if p1["user_id"] in paired_players_ids:
             continue  # Already paired
@@ -1218,9 +1640,7 @@ def generate_swiss_round_matches(
                 continue
 
             # Check for rematches
-            if not has_played_against(
-                p1["user_id"], p2["user_id"], all_previous_matches
-            ):
+            if frozenset((p1["user_id"], p2["user_id"])) not in played:
                 match_in_round_idx += 1
                 m_dets = {
                     "tournament_id": tournament_id,
@@ -1237,7 +1657,7 @@ def generate_swiss_round_matches(
                 matches_for_round.append(m_dets)
                 paired_players_ids.add(p1["user_id"])
                 paired_players_ids.add(p2["user_id"])
-                unpaired_players.pop(i)  # Remove p2 from unpaired list
+                del unpaired_players[i]  # Remove p2 from unpaired queue
                 found_opponent = True
                 break
 
@@ -1273,6 +1693,21 @@ def generate_swiss_round_matches(
     return matches_for_round
 
 
+# Static announcement lines of the Swiss knockout stage, escaped once
+_KO_INTRO_ESC = escape_markdown_v2(
+    "Top qualifiers from the Swiss league stage will now battle it out in a single-elimination bracket\\."
+)
+_KO_NO_FINAL_ESC = escape_markdown_v2(
+    "\n⚠️ Bracket generation completed, but no final match node identified. Check logs."
+)
+_KO_MULTIPLE_FINALS_ESC = escape_markdown_v2(
+    "\n⚠️ Bracket generation completed with multiple final nodes. This indicates an issue."
+)
+_KO_GOOD_LUCK_ESC = escape_markdown_v2(
+    "\nGood luck to all knockout participants! Use `/report_score <Match_ID> <your_score> <opponent_score>` to report your results."
+)
+
+
 async def generate_swiss_knockout_bracket(
     context: ContextTypes.DEFAULT_TYPE,
     tournament_id: str,
@@ -1333,19 +1768,15 @@ async def generate_swiss_knockout_bracket(
         escape_markdown_v2(
             f"\n🔥 *Knockout Stage Initiated for {tournament_name}!*")
     ]
-    parts_ko_gen.append(
-        escape_markdown_v2(
-            "Top qualifiers from the Swiss league stage will now battle it out in a single-elimination bracket\\."
-        )
-    )
+    parts_ko_gen.append(_KO_INTRO_ESC)
 
     num_knockout_players = len(qualifying_players)
+    # Exact integer ceil(log2(n)): the bits needed to count up to n - 1
     num_rounds_full_bracket = (
-        math.ceil(math.log2(num_knockout_players)
-                  ) if num_knockout_players > 0 else 0
+        (num_knockout_players - 1).bit_length() if num_knockout_players > 0 else 0
     )
     full_knockout_bracket_size = (
-        2**num_rounds_full_bracket if num_knockout_players > 0 else 0
+        1 << num_rounds_full_bracket if num_knockout_players > 0 else 0
     )
 
     knockout_participants_data = list(qualifying_players) + [
@@ -1361,6 +1792,7 @@ async def generate_swiss_knockout_bracket(
 
     # First round of knockout (from advancing players and BYEs)
     match_in_round_idx_ko = 0
+    first_round_ko = []  # (match details, node index, announcement index)
     while temp_player_processing_list_ko:
         p1_data = temp_player_processing_list_ko.pop(0)
         if (
@@ -1397,27 +1829,12 @@ async def generate_swiss_knockout_bracket(
                 "next_match_id": None,
                 "group_id": None,  # No group for knockout matches
             }
-            m_id_ko = add_match_to_db(m_dets_ko)
-            if m_id_ko:
-                active_nodes_for_next_ko_round.append(
-                    {"type": "match", "id": m_id_ko})
-                parts_ko_gen.append(
-                    f"  KO R{current_round_num_ko} M{match_in_round_idx_ko}: {
-                        escape_markdown_v2(
-                            m_dets_ko['player1_username'])} vs {
-                        escape_markdown_v2(
-                            m_dets_ko['player2_username'])} \\(ID: `{m_id_ko}`\\)"
-                )
-                await notify_players_of_match(
-                    context,
-                    m_id_ko,
-                    tournament_id,
-                    tournament_name,
-                    p1_data["user_id"],
-                    p1_data["username"],
-                    p2_data["user_id"],
-                    p2_data["username"],
-                )
+            first_round_ko.append(
+                (m_dets_ko, len(active_nodes_for_next_ko_round), len(parts_ko_gen))
+            )
+            # Placeholders, filled in once the round is inserted in one batch
+            active_nodes_for_next_ko_round.append(None)
+            parts_ko_gen.append(None)
         elif p1_data["user_id"] is not None:  # p2 is BYE
             active_nodes_for_next_ko_round.append(
                 {
@@ -1445,8 +1862,41 @@ async def generate_swiss_knockout_bracket(
                         p2_data['username'])} gets a BYE \\(vs virtual BYE player\\)\\."
             )
 
+    first_round_ids = add_matches_bulk([m for m, _, _ in first_round_ko])
+    for (m_dets_ko, node_idx, part_idx), m_id_ko in zip(
+        first_round_ko, first_round_ids
+    ):
+        active_nodes_for_next_ko_round[node_idx] = {
+            "type": "match", "id": m_id_ko}
+        parts_ko_gen[part_idx] = (
+            f"  KO R{current_round_num_ko} M{m_dets_ko['match_in_round_index']}: {
+                escape_markdown_v2(
+                    m_dets_ko['player1_username'])} vs {
+                escape_markdown_v2(
+                    m_dets_ko['player2_username'])} \\(ID: `{m_id_ko}`\\)"
+        )
+    # Drop the placeholders of matches that could not be created
+    active_nodes_for_next_ko_round = [
+        n for n in active_nodes_for_next_ko_round if n is not None]
+    parts_ko_gen = [part for part in parts_ko_gen if part is not None]
+    # Notifications are sent together once the whole bracket is stored
+    pending_notifies = [
+        notify_players_of_match(
+            context,
+            m_id_ko,
+            tournament_id,
+            tournament_name,
+            m_dets_ko["player1_user_id"],
+            m_dets_ko["player1_username"],
+            m_dets_ko["player2_user_id"],
+            m_dets_ko["player2_username"],
+        )
+        for (m_dets_ko, _, _), m_id_ko in zip(first_round_ko, first_round_ids)
+    ]
+
     # Build subsequent knockout rounds (shell matches)
     current_round_num_ko += 1  # Move to next round
+    links: list[tuple[int, int]] = []
     while len(active_nodes_for_next_ko_round) > 1:
         match_in_idx_shell = 0
         temp_active_shell_nodes = list(active_nodes_for_next_ko_round)
@@ -1509,43 +1959,30 @@ async def generate_swiss_knockout_bracket(
                 {"type": "match", "id": new_shell_id})
 
             # Link previous matches to this new shell match
-            conn_link = sqlite3.connect(DB_NAME)
-            cur_link = conn_link.cursor()
-            try:
-                if node1_adv["type"] == "match":
-                    cur_link.execute(
-                        "UPDATE matches SET next_match_id = ? WHERE match_id = ?",
-                        (new_shell_id, node1_adv["id"]),
-                    )
-                if node2_adv["type"] == "match":
-                    cur_link.execute(
-                        "UPDATE matches SET next_match_id = ? WHERE match_id = ?",
-                        (new_shell_id, node2_adv["id"]),
-                    )
-                conn_link.commit()
-            except sqlite3.Error as e_link:
-                logger.error(
-                    f"Error linking previous knockout matches to shell {new_shell_id}: {e_link}"
-                )
-            finally:
-                conn_link.close()
+            for node_adv in (node1_adv, node2_adv):
+                if node_adv["type"] == "match":
+                    links.append((new_shell_id, node_adv["id"]))
 
             if (
                 shell_dets["status"] == "scheduled"
             ):  # If this match is now fully determined
-                await notify_players_of_match(
-                    context,
-                    new_shell_id,
-                    tournament_id,
-                    tournament_name,
-                    shell_dets["player1_user_id"],
-                    shell_dets["player1_username"],
-                    shell_dets["player2_user_id"],
-                    shell_dets["player2_username"],
+                pending_notifies.append(
+                    notify_players_of_match(
+                        context,
+                        new_shell_id,
+                        tournament_id,
+                        tournament_name,
+                        shell_dets["player1_user_id"],
+                        shell_dets["player1_username"],
+                        shell_dets["player2_user_id"],
+                        shell_dets["player2_username"],
+                    )
                 )
         current_round_num_ko += (
             1  # Advance round number after processing all matches in current shell
         )
+    link_next_matches(links)
+    await gather_notifications(pending_notifies)
 
     # Final message about knockout stage
     if (
@@ -1559,98 +1996,90 @@ async def generate_swiss_knockout_bracket(
             )
         )
     elif not active_nodes_for_next_ko_round and num_knockout_qualifiers > 0:
-        parts_ko_gen.append(
-            escape_markdown_v2(
-                "\n⚠️ Bracket generation completed, but no final match node identified. Check logs."
-            )
-        )
+        parts_ko_gen.append(_KO_NO_FINAL_ESC)
     elif len(active_nodes_for_next_ko_round) > 1:
-        parts_ko_gen.append(
-            escape_markdown_v2(
-                "\n⚠️ Bracket generation completed with multiple final nodes. This indicates an issue."
-            )
-        )
+        parts_ko_gen.append(_KO_MULTIPLE_FINALS_ESC)
 
     if num_qualifiers > 1:
-        parts_ko_gen.append(
-            escape_markdown_v2(
-                "\nGood luck to all knockout participants! Use `/report_score <Match_ID> <your_score> <opponent_score>` to report your results."
-            )
-        )
+        parts_ko_gen.append(_KO_GOOD_LUCK_ESC)
     await send_public_announcement(context, tournament_id, "\n".join(parts_ko_gen))
 
 
+@db_op(default=False)
+def update_match_status(match_id: int, status: str) -> bool:
+    """Sets a match's status, e.g. while its score reports are reconciled."""
+    with get_write_conn() as conn:
+        return conn.execute(
+            "UPDATE matches SET status = ? WHERE match_id = ?", (status, match_id)
+        ).rowcount > 0
+
+
 # --- NEW DATABASE HELPER FUNCTIONS FOR GROUP STAGE & KNOCKOUT ---
+@db_op()
 def add_group_to_db(tournament_id: str, group_name: str) -> int | None:
     """Adds a new group to the database for a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
+    with get_write_conn() as conn:
+        return conn.execute(
             "INSERT INTO groups_tournament (tournament_id, group_name) VALUES (?, ?)",
             (tournament_id, group_name),
-        )
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.Error as e:
-        logger.error(f"DB add_group_to_db: {e}")
-        return None
-    finally:
-        conn.close()
+        ).lastrowid
 
 
-def add_player_to_group_db(group_id: int, user_id: int, username: str) -> bool:
-    """Adds a player to a specific group."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
+@db_op(default=False)
+def add_players_to_group_db(group_id: int, players: list) -> bool:
+    """Adds a batch of players to a specific group in one transaction."""
+    with db_tx() as conn:
+        conn.executemany(
             "INSERT INTO group_participants (group_id, user_id, username) VALUES (?, ?, ?)",
-            (group_id, user_id, username),
+            [(group_id, p["user_id"], p["username"]) for p in players],
         )
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
-        logger.error(f"DB add_player_to_group_db: {e}")
-        return False
-    finally:
-        conn.close()
+    return True
 
 
 def get_groups_for_tournament(tournament_id: str) -> list:
     """Fetches all groups associated with a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT group_id, group_name FROM groups_tournament WHERE tournament_id = ? ORDER BY group_name",
-            (tournament_id,),
-        )
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_groups_for_tournament: {e}")
-        return []
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT group_id, group_name FROM groups_tournament WHERE tournament_id = ? ORDER BY group_name",
+                (tournament_id,),
+            )
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_groups_for_tournament: {e}")
+            return []
 
 
 def get_players_in_group(group_id: int) -> list:
     """Fetches all players assigned to a specific group."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT user_id, username FROM group_participants WHERE group_id = ?",
-            (group_id,),
-        )
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_players_in_group: {e}")
-        return []
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT user_id, username FROM group_participants WHERE group_id = ?",
+                (group_id,),
+            )
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"DB get_players_in_group: {e}")
+            return []
+
+
+_GROUP_STAGE_STANDINGS_UPSERT_SQL = """
+    INSERT INTO group_stage_standings (
+        tournament_id, group_id, user_id, username, games_played,
+        wins, draws, losses, goals_for, goals_against, points
+    ) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tournament_id, group_id, user_id) DO UPDATE SET
+        games_played = games_played + 1,
+        wins = wins + excluded.wins,
+        draws = draws + excluded.draws,
+        losses = losses + excluded.losses,
+        goals_for = goals_for + excluded.goals_for,
+        goals_against = goals_against + excluded.goals_against,
+        points = points + excluded.points
+"""
 
 
 def update_group_stage_player_stats(
@@ -1660,263 +2089,206 @@ def update_group_stage_player_stats(
     username: str,
     goals_for: int,
     goals_against: int,
+    conn: sqlite3.Connection | None = None,
 ):
-    """Updates a player's statistics in the group_stage_standings table."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO group_stage_standings (tournament_id, group_id, user_id, username)
-            VALUES (?, ?, ?, ?)
-        """,
-            (tournament_id, group_id, user_id, username),
-        )
-
-        wins = 0
-        draws = 0
-        losses = 0
-        points_earned = 0
-        if goals_for > goals_against:
-            wins = 1
-            points_earned = POINTS_FOR_WIN
-        elif goals_for == goals_against:
-            draws = 1
-            points_earned = POINTS_FOR_DRAW
-        else:
-            losses = 1
-            points_earned = POINTS_FOR_LOSS
-
-        goal_difference = goals_for - goals_against
+    """
+    Updates a player's statistics in the group_stage_standings table.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction; errors then propagate so the transaction rolls back.
+    """
+    wins = 0
+    draws = 0
+    losses = 0
+    points_earned = 0
+    if goals_for > goals_against:
+        wins = 1
+        points_earned = POINTS_FOR_WIN
+    elif goals_for == goals_against:
+        draws = 1
+        points_earned = POINTS_FOR_DRAW
+    else:
+        losses = 1
+        points_earned = POINTS_FOR_LOSS
 
-        cursor.execute(
-            """
-            UPDATE group_stage_standings
-            SET
-                games_played = games_played + 1,
-                wins = wins + ?,
-                draws = draws + ?,
-                losses = losses + ?,
-                goals_for = goals_for + ?,
-                goals_against = goals_against + ?,
-                goal_difference = goal_difference + ?,
-                points = points + ?
-            WHERE tournament_id = ? AND group_id = ? AND user_id = ?
-        """,
-            (
-                wins,
-                draws,
-                losses,
-                goals_for,
-                goals_against,
-                goal_difference,
-                points_earned,
-                tournament_id,
-                group_id,
-                user_id,
-            ),
-        )
-        conn.commit()
-        logger.info(
-            f"Updated group stage standings for user {user_id} in T_ID {tournament_id}, Group {group_id}."
-        )
+    params = (
+        tournament_id,
+        group_id,
+        user_id,
+        username,
+        wins,
+        draws,
+        losses,
+        goals_for,
+        goals_against,
+        points_earned,
+    )
+    if conn is not None:
+        conn.execute(_GROUP_STAGE_STANDINGS_UPSERT_SQL, params)
+        return
+    try:
+        with get_write_conn() as conn:
+            # Creates the standings row on the first result, otherwise adds to it
+            conn.execute(_GROUP_STAGE_STANDINGS_UPSERT_SQL, params)
+            logger.info(
+                f"Updated group stage standings for user {user_id} in T_ID {tournament_id}, Group {group_id}."
+            )
+        invalidate_standings(tournament_id, group_id)
     except sqlite3.Error as e:
         logger.error(
             f"DB error updating group stage standings for user {user_id} in T_ID {tournament_id}, Group {group_id}: {e}"
         )
-        conn.rollback()
-    finally:
-        conn.close()
 
 
 def get_group_stage_standings(tournament_id: str, group_id: int) -> list:
     """Fetches standings for a specific group in a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
     try:
-        cursor.execute(
-            """
-            SELECT username, user_id, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
-            FROM group_stage_standings
-            WHERE tournament_id = ? AND group_id = ?
-            ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
-        """,
+        return _cached_standings(
+            (tournament_id, group_id),
+            _GROUP_STAGE_STANDINGS_SQL,
             (tournament_id, group_id),
         )
-        return cursor.fetchall()
     except sqlite3.Error as e:
         logger.error(
             f"DB get_group_stage_standings for T_ID {tournament_id}, G_ID {group_id}: {e}"
         )
         return []
-    finally:
-        conn.close()
+
+
+_ADVANCING_PLAYERS_SQL = """
+    SELECT group_id, username, user_id, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY group_id
+            ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
+        ) AS group_rank
+        FROM group_stage_standings
+        WHERE tournament_id = ?
+    )
+    WHERE group_rank <= 2
+    ORDER BY group_id, group_rank
+"""
 
 
 def get_advancing_players_from_groups(tournament_id: str) -> list:
     """Determines and returns players advancing from group stages (top 2 from each group)."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    advancing_players = []
     try:
-        groups = get_groups_for_tournament(tournament_id)
-        for group in groups:
-            group_id = group["group_id"]
-            standings = get_group_stage_standings(tournament_id, group_id)
-            # Take top 2 from each group
-            if len(standings) >= 2:
-                advancing_players.append(standings[0])
-                advancing_players.append(standings[1])
-            elif len(standings) == 1:  # If only one player somehow, they advance
-                advancing_players.append(standings[0])
-            else:
-                logger.warning(
-                    f"Tournament {tournament_id}: Group {group_id} has no players in standings."
-                )
+        with get_conn() as conn:
+            return conn.execute(_ADVANCING_PLAYERS_SQL, (tournament_id,)).fetchall()
     except sqlite3.Error as e:
         logger.error(
             f"DB get_advancing_players_from_groups for T_ID {tournament_id}: {e}"
         )
-    finally:
-        conn.close()
-    return advancing_players
+        return []
+
+
+_MATCHES_FOR_GROUP_SQL = (
+    "SELECT * FROM matches WHERE tournament_id = ? AND group_id = ? "
+    "ORDER BY round_number, match_in_round_index"
+)
+_MATCHES_FOR_GROUP_BY_STATUS_SQL = (
+    "SELECT * FROM matches WHERE tournament_id = ? AND group_id = ? AND status = ? "
+    "ORDER BY round_number, match_in_round_index"
+)
 
 
 def get_matches_for_group(
     tournament_id: str, group_id: int, match_status: str | None = None
 ) -> list:
     """Fetches matches for a specific group in a tournament."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
     matches_list = []
-    query = "SELECT * FROM matches WHERE tournament_id = ? AND group_id = ?"
-    params = [tournament_id, group_id]
     if match_status:
-        query += " AND status = ?"
-        params.append(match_status)
-    query += " ORDER BY round_number, match_in_round_index"
+        query = _MATCHES_FOR_GROUP_BY_STATUS_SQL
+        params = (tournament_id, group_id, match_status)
+    else:
+        query = _MATCHES_FOR_GROUP_SQL
+        params = (tournament_id, group_id)
     try:
-        cursor.execute(query, tuple(params))
-        matches_list = cursor.fetchall()
+        with get_conn() as conn:
+            matches_list = conn.execute(query, params).fetchall()
     except sqlite3.Error as e:
         logger.error(
             f"DB get_matches_for_group {tournament_id}, group {group_id}: {e}")
-    finally:
-        conn.close()
     return matches_list
 
 
 # --- NEW Score Submission Helper Functions ---
+_ADD_SCORE_SUBMISSION_SQL = """
+    INSERT INTO score_submissions (match_id, user_id, score_p1, score_p2)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(match_id, user_id) DO UPDATE SET
+        score_p1 = EXCLUDED.score_p1,
+        score_p2 = EXCLUDED.score_p2,
+        submission_time = CURRENT_TIMESTAMP
+"""
+_SCORE_SUBMISSIONS_FOR_MATCH_SQL = "SELECT * FROM score_submissions WHERE match_id = ?"
+_CLEAR_SCORE_SUBMISSIONS_SQL = "DELETE FROM score_submissions WHERE match_id = ?"
+
+
+@db_op(default=False)
 def add_score_submission(
     match_id: int, user_id: int, score_p1: int, score_p2: int
 ) -> bool:
     """Adds a score submission for a match by a specific user."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            INSERT INTO score_submissions (match_id, user_id, score_p1, score_p2)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(match_id, user_id) DO UPDATE SET
-                score_p1 = EXCLUDED.score_p1,
-                score_p2 = EXCLUDED.score_p2,
-                submission_time = CURRENT_TIMESTAMP
-        """,
-            (match_id, user_id, score_p1, score_p2),
-        )
-        conn.commit()
-        logger.info(
-            f"Score submission for match {match_id} by user {user_id} recorded."
+    with get_write_conn() as conn:
+        conn.execute(
+            _ADD_SCORE_SUBMISSION_SQL, (match_id, user_id, score_p1, score_p2)
         )
-        return True
-    except sqlite3.Error as e:
-        logger.error(f"DB add_score_submission: {e}")
-        return False
-    finally:
-        conn.close()
+    logger.info(
+        f"Score submission for match {match_id} by user {user_id} recorded."
+    )
+    return True
 
 
+@db_op(default=[])
 def get_score_submissions_for_match(match_id: int) -> list:
     """Fetches all score submissions for a given match."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT * FROM score_submissions WHERE match_id = ?", (match_id,)
-        )
-        return cursor.fetchall()
-    except sqlite3.Error as e:
-        logger.error(f"DB get_score_submissions_for_match: {e}")
-        return []
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        return conn.execute(
+            _SCORE_SUBMISSIONS_FOR_MATCH_SQL, (match_id,)).fetchall()
 
 
+@db_op(default=False)
 def clear_score_submissions_for_match(match_id: int) -> bool:
     """Clears all score submissions for a specific match."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "DELETE FROM score_submissions WHERE match_id = ?", (match_id,))
-        conn.commit()
-        logger.info(f"Cleared score submissions for match {match_id}.")
-        return True
-    except sqlite3.Error as e:
-        logger.error(f"DB clear_score_submissions_for_match: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_write_conn() as conn:
+        conn.execute(_CLEAR_SCORE_SUBMISSIONS_SQL, (match_id,))
+    logger.info(f"Cleared score submissions for match {match_id}.")
+    return True
 
 
 # --- Table Generation Helper Function ---
+# League table columns and their widths. The header, separator and row
+# format never change, so they are built once at import.
+_LEAGUE_COLUMNS = (
+    ("#", 2),  # rank
+    ("Team", 15),  # Adjusted for shorter names, can be increased if needed
+    ("Pl", 2),
+    ("W", 1),
+    ("D", 1),
+    ("L", 1),
+    ("+/-", 5),  # For "GF-GA" format
+    ("GD", 4),
+    ("Pts", 2),
+)
+_LEAGUE_TEAM_WIDTH = _LEAGUE_COLUMNS[1][1]
+_LEAGUE_ROW_FMT = " ".join(f"{{:<{width}}}" for _, width in _LEAGUE_COLUMNS)
+_LEAGUE_HEADER = _LEAGUE_ROW_FMT.format(*(title for title, _ in _LEAGUE_COLUMNS))
+_LEAGUE_SEP = "-" * len(_LEAGUE_HEADER)
+
+
 def generate_league_table(team_data):
     """
     Generates a league table string formatted like the provided image.
     This function produces PLAIN TEXT, no Markdown escaping needed inside it.
     """
 
-    COL_WIDTHS = {
-        "rank": 2,
-        "team": 15,  # Adjusted for shorter names, can be increased if needed
-        "pl": 2,
-        "w": 1,
-        "d": 1,
-        "l": 1,
-        "plus_minus": 5,  # For "GF-GA" format
-        "gd": 4,
-        "pts": 2,
-    }
-
-    # Header row
-    header = (
-        f"{'#':<{COL_WIDTHS['rank']}} "
-        f"{'Team':<{COL_WIDTHS['team']}} "
-        f"{'Pl':<{COL_WIDTHS['pl']}} "
-        f"{'W':<{COL_WIDTHS['w']}} "
-        f"{'D':<{COL_WIDTHS['d']}} "
-        f"{'L':<{COL_WIDTHS['l']}} "
-        f"{'+/-':<{COL_WIDTHS['plus_minus']}} "
-        f"{'GD':<{COL_WIDTHS['gd']}} "
-        f"{'Pts':<{COL_WIDTHS['pts']}}"
-    )
-
-    # Separator line (adjust length based on header)
-    separator = "-" * len(header)
-
-    table_lines = [header, separator]
+    table_lines = [_LEAGUE_HEADER, _LEAGUE_SEP]
 
     for team in team_data:
         # Truncate team name if it's too long
         team_name_display = team["team_name"]
-        if len(team_name_display) > COL_WIDTHS["team"]:
-            team_name_display = team_name_display[:
-                                                  COL_WIDTHS["team"] - 3] + "..."
+        if len(team_name_display) > _LEAGUE_TEAM_WIDTH:
+            team_name_display = team_name_display[:_LEAGUE_TEAM_WIDTH - 3] + "..."
 
         # Format goal difference with a sign (+ or -)
         gd_display = (
@@ -1927,18 +2299,19 @@ def generate_league_table(team_data):
         # Format goals for/against as "GF-GA"
         plus_minus_display = f"{team['goals_for']}-{team['goals_against']}"
 
-        row = (
-            f"{str(team['rank']):<{COL_WIDTHS['rank']}} "
-            f"{team_name_display:<{COL_WIDTHS['team']}} "
-            f"{str(team['played']):<{COL_WIDTHS['pl']}} "
-            f"{str(team['wins']):<{COL_WIDTHS['w']}} "
-            f"{str(team['draws']):<{COL_WIDTHS['d']}} "
-            f"{str(team['losses']):<{COL_WIDTHS['l']}} "
-            f"{plus_minus_display:<{COL_WIDTHS['plus_minus']}} "
-            f"{gd_display:<{COL_WIDTHS['gd']}} "
-            f"{str(team['points']):<{COL_WIDTHS['pts']}}"
+        table_lines.append(
+            _LEAGUE_ROW_FMT.format(
+                team["rank"],
+                team_name_display,
+                team["played"],
+                team["wins"],
+                team["draws"],
+                team["losses"],
+                plus_minus_display,
+                gd_display,
+                team["points"],
+            )
         )
-        table_lines.append(row)
 
     return "\n".join(table_lines)
 
@@ -1949,19 +2322,26 @@ async def send_public_announcement(
     tournament_id: str,
     message_text: str,
     parse_mode: str = "MarkdownV2",
+    group_chat_id: int | None = None,
 ):
-    """Sends a public announcement to the tournament's designated group chat."""
+    """
+    Sends a public announcement to the tournament's designated group chat.
+    Callers that already hold the tournament row can pass its group_chat_id
+    to skip looking the tournament up again.
+    """
     if not tournament_id:
         logger.warning(
             "send_public_announcement called without tournament_id.")
         return
-    tournament_details = get_tournament_details_by_id(tournament_id)
-    if not tournament_details:
-        logger.warning(
-            f"send_public_announcement: Tournament {tournament_id} not found for announcement."
-        )
-        return
-    group_chat_id = tournament_details.get("group_chat_id")
+    tournament_details = None
+    if group_chat_id is None:
+        tournament_details = get_tournament_details_by_id(tournament_id)
+        if not tournament_details:
+            logger.warning(
+                f"send_public_announcement: Tournament {tournament_id} not found for announcement."
+            )
+            return
+        group_chat_id = tournament_details.get("group_chat_id")
     if group_chat_id:
         try:
             await context.bot.send_message(
@@ -1974,6 +2354,8 @@ async def send_public_announcement(
             logger.warning(
                 f"Bot is forbidden to send messages to group {group_chat_id} for T_ID {tournament_id}."
             )
+            if tournament_details is None:
+                tournament_details = get_tournament_details_by_id(tournament_id) or {}
             creator_id = tournament_details.get("creator_id")
             if creator_id:
                 try:
@@ -2005,17 +2387,23 @@ async def send_creator_log(
     tournament_id: str,
     message: str,
     parse_mode: str = "MarkdownV2",
+    creator_id: int | None = None,
 ):
-    """Sends a log message to the tournament creator's private chat."""
+    """
+    Sends a log message to the tournament creator's private chat.
+    Pass creator_id when the tournament row is already at hand.
+    """
     if not tournament_id:
         return
 
-    tournament_details = get_tournament_details_by_id(tournament_id)
-    if not tournament_details or not tournament_details.get("creator_id"):
+    if creator_id is None:
+        tournament_details = get_tournament_details_by_id(tournament_id)
+        if not tournament_details:
+            return
+        creator_id = tournament_details.get("creator_id")
+    if not creator_id:
         return
 
-    creator_id = tournament_details["creator_id"]
-
     try:
         await context.bot.send_message(
             chat_id=creator_id, text=message, parse_mode=parse_mode
@@ -2030,6 +2418,54 @@ async def send_creator_log(
         logger.error(f"Failed to send log to creator {creator_id}: {e}")
 
 
+# Static glory board text and small round numbers, escaped once at import
+_NA_ESC = escape_markdown_v2("N/A")
+_GLORY_PATH_TITLE_ESC = escape_markdown_v2("Champion s Path to Victory")
+_GLORY_UNDEFEATED_ESC = escape_markdown_v2(
+    "  An incredible undefeated run or bye to victory!")
+_GLORY_SEASON_STATS_ESC = escape_markdown_v2("  Season Statistics:")
+_GLORY_SEPARATOR_ESC = escape_markdown_v2("----------------------------------------")
+_GLORY_CONGRATS_ESC = escape_markdown_v2(
+    "Huge congratulations to all participants! 👏")
+_ROUND_ESC = tuple(escape_markdown_v2(str(i)) for i in range(128))
+
+
+def get_runner_up(tournament: dict, champion_id: int) -> str | None:
+    """
+    Returns the runner-up's display name for a finished tournament, or None
+    if it can't be determined. Knockout formats take the champion's opponent
+    in the final; Round Robin takes second place in the standings.
+    """
+    t_type = tournament.get("type")
+    if t_type == "Round Robin":
+        standings = get_round_robin_standings(tournament["id"])
+        if len(standings) > 1 and standings[0]["user_id"] == champion_id:
+            return standings[1]["username"] or f"User_{standings[1]['user_id']}"
+        return None
+    if not (
+        t_type in ("Single Elimination", "Group Stage & Knockout")
+        or (t_type == "Swiss" and tournament.get("status") == "completed")
+    ):
+        return None
+    final_match = get_final_match_details(tournament["id"])
+    if not final_match:
+        return None
+    if final_match["player1_user_id"] == champion_id:
+        opponent = "player2"
+    elif final_match["player2_user_id"] == champion_id:
+        opponent = "player1"
+    else:
+        return None
+    opponent_id = final_match[f"{opponent}_user_id"]
+    if not opponent_id:
+        return None
+    return (
+        final_match[f"{opponent}_username"]
+        or get_player_username_by_id(opponent_id)
+        or "Runner-Up"
+    )
+
+
 async def send_tournament_glory_board(
     context: ContextTypes.DEFAULT_TYPE,
     tournament_details: dict,
@@ -2059,80 +2495,21 @@ async def send_tournament_glory_board(
         tournament_details.get(
             "conditions", "None"))
 
-    runner_up_username_esc = escape_markdown_v2("N/A")
-    # Determine runner-up based on tournament type
-    if tournament_details.get("type") == "Single Elimination" or (
-        tournament_details.get("type") == "Swiss"
-        and tournament_details.get("status") == "completed"
-    ):  # For Swiss, check final KO match
-        final_match = get_final_match_details(t_id)
-        if final_match:
-            p1_id_final = final_match.get("player1_user_id")
-            p2_id_final = final_match.get("player2_user_id")
-            if p1_id_final == champion_id and p2_id_final:
-                runner_up_display_name = (
-                    final_match.get("player2_username")
-                    or get_player_username_by_id(p2_id_final)
-                    or "Runner-Up"
-                )
-                runner_up_username_esc = escape_markdown_v2(
-                    runner_up_display_name)
-            elif p2_id_final == champion_id and p1_id_final:
-                runner_up_display_name = (
-                    final_match.get("player1_username")
-                    or get_player_username_by_id(p1_id_final)
-                    or "Runner-Up"
-                )
-                runner_up_username_esc = escape_markdown_v2(
-                    runner_up_display_name)
-    elif tournament_details.get("type") == "Round Robin":
-        conn_rr = sqlite3.connect(DB_NAME)
-        conn_rr.row_factory = dict_factory
-        cursor_rr = conn_rr.cursor()
-        try:
-            cursor_rr.execute(
-                """
-                SELECT username, user_id FROM round_robin_standings
-                WHERE tournament_id = ?
-                ORDER BY points DESC, goal_difference DESC, goals_for DESC, username ASC
-                LIMIT 2
-            """,
-                (t_id,),
-            )
-            top_two = cursor_rr.fetchall()
-            if len(top_two) > 1 and top_two[0]["user_id"] == champion_id:
-                runner_up_username_esc = escape_markdown_v2(
-                    top_two[1]["username"] or f"User_{top_two[1]['user_id']}"
-                )
-        except sqlite3.Error as e:
-            logger.error(
-                f"Error fetching RR/Swiss standings for glory board: {e}")
-        finally:
-            conn_rr.close()
-    elif tournament_details.get("type") == "Group Stage & Knockout":
-        final_ko_match = get_final_match_details(t_id)
-        if final_ko_match:
-            p1_id_final = final_ko_match.get("player1_user_id")
-            p2_id_final = final_ko_match.get("player2_user_id")
-            if p1_id_final == champion_id and p2_id_final:
-                runner_up_display_name = (
-                    final_ko_match.get("player2_username")
-                    or get_player_username_by_id(p2_id_final)
-                    or "Runner-Up"
-                )
-                runner_up_username_esc = escape_markdown_v2(
-                    runner_up_display_name)
-            elif p2_id_final == champion_id and p1_id_final:
-                runner_up_display_name = (
-                    final_ko_match.get("player1_username")
-                    or get_player_username_by_id(p1_id_final)
-                    or "Runner-Up"
-                )
-                runner_up_username_esc = escape_markdown_v2(
-                    runner_up_display_name)
+    # Round Robin runner-up and champion stats both come from the standings,
+    # which get_round_robin_standings serves from its cache
+    rr_standings = (
+        get_round_robin_standings(t_id)
+        if tournament_details.get("type") == "Round Robin"
+        else []
+    )
+
+    runner_up = get_runner_up(tournament_details, champion_id)
+    runner_up_username_esc = (
+        _NA_ESC if runner_up is None else escape_markdown_v2(runner_up)
+    )
 
     path_to_victory_parts = [
-        f"✨ *{escape_markdown_v2('Champion s Path to Victory')}* ✨"
+        f"✨ *{_GLORY_PATH_TITLE_ESC}* ✨"
     ]
     if tournament_details.get("type") in [
         "Single Elimination",
@@ -2146,23 +2523,23 @@ async def send_tournament_glory_board(
         if tournament_details.get("type") in [
                 "Group Stage & Knockout", "Swiss"]:
             champion_matches = [
-                m for m in champion_matches if m.get("group_id") is None
+                m for m in champion_matches if m["group_id"] is None
             ]
 
         if champion_matches:
             for match_won in champion_matches:
                 opponent_id = None
                 opponent_display_name = "Opponent"
-                if match_won.get("player1_user_id") == champion_id:
-                    opponent_id = match_won.get("player2_user_id")
-                    opponent_display_name = match_won.get("player2_username") or (
+                if match_won["player1_user_id"] == champion_id:
+                    opponent_id = match_won["player2_user_id"]
+                    opponent_display_name = match_won["player2_username"] or (
                         get_player_username_by_id(opponent_id)
                         if opponent_id
                         else "Opponent"
                     )
                 else:
-                    opponent_id = match_won.get("player1_user_id")
-                    opponent_display_name = match_won.get("player1_username") or (
+                    opponent_id = match_won["player1_user_id"]
+                    opponent_display_name = match_won["player1_username"] or (
                         get_player_username_by_id(opponent_id)
                         if opponent_id
                         else "Opponent"
@@ -2170,17 +2547,17 @@ async def send_tournament_glory_board(
 
                 opponent_username_esc = escape_markdown_v2(
                     opponent_display_name)
-                score_esc = escape_markdown_v2(match_won.get("score", "N/A"))
+                score_esc = escape_markdown_v2(match_won["score"])
 
                 round_prefix = "R"
                 if (
                     tournament_details.get("type") == "Group Stage & Knockout"
-                    and match_won.get("group_id") is None
+                    and match_won["group_id"] is None
                 ):
                     round_prefix = "KO R"
                 elif (
                     tournament_details.get("type") == "Swiss"
-                    and match_won.get("group_id") is None
+                    and match_won["group_id"] is None
                 ):
                     # For Swiss, if it's a KO match, it's a KO round. If it's a Swiss league match, it's a Swiss round.
                     # This logic assumes KO matches for Swiss will have round_number > num_swiss_rounds or a different indicator.
@@ -2195,73 +2572,53 @@ async def send_tournament_glory_board(
                             "Swiss R"  # This would be for the league phase matches
                         )
 
-                round_num_esc = escape_markdown_v2(
-                    str(match_won["round_number"]))
+                round_number = match_won["round_number"]
+                round_num_esc = (
+                    _ROUND_ESC[round_number]
+                    if 0 <= round_number < len(_ROUND_ESC)
+                    else escape_markdown_v2(str(round_number))
+                )
 
                 path_to_victory_parts.append(
                     f"  {round_prefix}{round_num_esc}: Defeated {opponent_username_esc} \\(Score: {score_esc}\\)"
                 )
         else:
-            path_to_victory_parts.append(
-                escape_markdown_v2(
-                    "  An incredible undefeated run or bye to victory!")
-            )
+            path_to_victory_parts.append(_GLORY_UNDEFEATED_ESC)
     elif tournament_details.get("type") == "Round Robin":
         # For Round Robin, show overall stats for the champion
-        conn_rr = sqlite3.connect(DB_NAME)
-        conn_rr.row_factory = dict_factory
-        cursor_rr = conn_rr.cursor()
-        try:
-            cursor_rr.execute(
-                """
-                SELECT games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points
-                FROM round_robin_standings
-                WHERE tournament_id = ? AND user_id = ?
-            """,
-                (t_id, champion_id),
-            )
-            champ_stats = cursor_rr.fetchone()
-            if champ_stats:
-                path_to_victory_parts.append(
-                    escape_markdown_v2("  Season Statistics:"))
-                path_to_victory_parts.append(
-                    escape_markdown_v2(
-                        f"    Games Played: {champ_stats['games_played']}"
-                    )
-                )
-                path_to_victory_parts.append(
-                    escape_markdown_v2(
-                        f"    Wins: {
-                            champ_stats['wins']}, Draws: {
-                            champ_stats['draws']}, Losses: {
-                            champ_stats['losses']}"
-                    )
+        champ_stats = next(
+            (row for row in rr_standings if row["user_id"] == champion_id), None
+        )
+        if champ_stats:
+            path_to_victory_parts.append(_GLORY_SEASON_STATS_ESC)
+            path_to_victory_parts.append(
+                escape_markdown_v2(
+                    f"    Games Played: {champ_stats['games_played']}"
                 )
-                path_to_victory_parts.append(
-                    escape_markdown_v2(
-                        f"    Goals For: {
-                            champ_stats['goals_for']}, Goals Against: {
-                            champ_stats['goals_against']}"
-                    )
+            )
+            path_to_victory_parts.append(
+                escape_markdown_v2(
+                    f"    Wins: {
+                        champ_stats['wins']}, Draws: {
+                        champ_stats['draws']}, Losses: {
+                        champ_stats['losses']}"
                 )
-                path_to_victory_parts.append(
-                    escape_markdown_v2(
-                        f"    Goal Difference: {
-                            champ_stats['goal_difference']}, Total Points: {
-                            champ_stats['points']}"
-                    )
+            )
+            path_to_victory_parts.append(
+                escape_markdown_v2(
+                    f"    Goals For: {
+                        champ_stats['goals_for']}, Goals Against: {
+                        champ_stats['goals_against']}"
                 )
-            else:
-                path_to_victory_parts.append(
-                    escape_markdown_v2(
-                        f"  Dominated the {
-                            tournament_details.get(
-                                'type', '')} tournament!"
-                    )
+            )
+            path_to_victory_parts.append(
+                escape_markdown_v2(
+                    f"    Goal Difference: {
+                        champ_stats['goal_difference']}, Total Points: {
+                        champ_stats['points']}"
                 )
-        except sqlite3.Error as e:
-            logger.error(
-                f"Error fetching champion RR/Swiss stats for glory board: {e}")
+            )
+        else:
             path_to_victory_parts.append(
                 escape_markdown_v2(
                     f"  Dominated the {
@@ -2269,17 +2626,15 @@ async def send_tournament_glory_board(
                             'type', '')} tournament!"
                 )
             )
-        finally:
-            conn_rr.close()
 
-    separator = escape_markdown_v2("----------------------------------------")
+    separator = _GLORY_SEPARATOR_ESC
     glory_board_caption_parts = [
         f"🎉🏆 *Tournament Concluded: {t_name_esc}* 🏆🎉\n",
         f"🥇   *C H A M P I O N* 🥇",
         f"      *{champion_username_esc}*",
         separator,
     ]
-    if runner_up_username_esc != escape_markdown_v2("N/A"):
+    if runner_up_username_esc != _NA_ESC:
         glory_board_caption_parts.append(
             f"\n🥈 Runner\\-Up: {runner_up_username_esc}")
 
@@ -2291,7 +2646,7 @@ async def send_tournament_glory_board(
         [
             "\n" + "\n".join(path_to_victory_parts),
             "\n" + separator + "\n",
-            escape_markdown_v2("Huge congratulations to all participants! 👏"),
+            _GLORY_CONGRATS_ESC,
         ]
     )
 
@@ -2346,12 +2701,10 @@ async def notify_players_of_match(
         f"   Match ID: `{match_id}`\n"
         f"   Fixture: {p1_name_esc} vs {p2_name_esc}"
     )
-    await send_creator_log(context, tournament_id, log_message)
     # --- END OF LOG ---
-    t_name_esc = escape_markdown_v2(tournament_name)
     match_id_esc = escape_markdown_v2(str(match_id))
-    p1_mention = f"[{escape_markdown_v2(player1_username)}](tg://user?id={player1_id})"
-    p2_mention = f"[{escape_markdown_v2(player2_username)}](tg://user?id={player2_id})"
+    p1_mention = f"[{p1_name_esc}](tg://user?id={player1_id})"
+    p2_mention = f"[{p2_name_esc}](tg://user?id={player2_id})"
 
     common_message_part = (
         f"🆔 Match ID: `{match_id_esc}`\n\n"
@@ -2360,43 +2713,211 @@ async def notify_players_of_match(
         f"Good luck\\!"
     )
 
-    msg_to_p1 = (
-        f"📢 Your match in tournament '{t_name_esc}' is scheduled\\!\n\n"
-        f"⚔️ **You \\({p1_mention}\\) vs {p2_mention}**\n"
-        f"{common_message_part}"
-    )
-    msg_to_p2 = (
+    # Each player gets the same message with the two mentions swapped
+    msg_to_p1, msg_to_p2 = (
         f"📢 Your match in tournament '{t_name_esc}' is scheduled\\!\n\n"
-        f"⚔️ **You \\({p2_mention}\\) vs {p1_mention}**\n"
+        f"⚔️ **You \\({you}\\) vs {opponent}**\n"
         f"{common_message_part}"
+        for you, opponent in ((p1_mention, p2_mention), (p2_mention, p1_mention))
     )
 
-    for player_id, message in [
-            (player1_id, msg_to_p1), (player2_id, msg_to_p2)]:
-        try:
-            await context.bot.send_message(player_id, message, parse_mode="MarkdownV2")
-            logger.info(
-                f"Sent match notification DM to P_ID {player_id} for match {match_id}"
-            )
-        except Forbidden:
+    # Nobody waits on the creator log, so it runs in the background; the
+    # Application keeps a reference to the task and reports any error it
+    # raises. The two DMs are sent together.
+    context.application.create_task(
+        send_creator_log(context, tournament_id, log_message))
+    dm_results = await asyncio.gather(
+        context.bot.send_message(player1_id, msg_to_p1, parse_mode="MarkdownV2"),
+        context.bot.send_message(player2_id, msg_to_p2, parse_mode="MarkdownV2"),
+        return_exceptions=True,
+    )
+    for player_id, player_mention, result in (
+        (player1_id, p1_mention, dm_results[0]),
+        (player2_id, p2_mention, dm_results[1]),
+    ):
+        if isinstance(result, Forbidden):
             logger.warning(
                 f"Could not DM P_ID {player_id} for match {match_id}. Bot blocked or chat not started."
             )
             tournament_details = get_tournament_details_by_id(tournament_id)
             if tournament_details:
-                player_display_name_for_announcement = (
-                    player1_username if player_id == player1_id else player2_username
-                )
-                player_mention_for_announcement = f"[{escape_markdown_v2(player_display_name_for_announcement)}](tg://user?id={player_id})"
                 await send_public_announcement(
                     context,
                     tournament_id,
-                    f"⚠️ Could not notify {player_mention_for_announcement} via DM for match `{match_id_esc}`\\. "
+                    f"⚠️ Could not notify {player_mention} via DM for match `{match_id_esc}`\\. "
                     f"Please ensure they have started a chat with the bot and unblocked it\\.",
                 )
-        except Exception as e:
+        elif isinstance(result, Exception):
             logger.error(
-                f"Error DMing P_ID {player_id} for match {match_id}: {e}")
+                f"Error DMing P_ID {player_id} for match {match_id}: {result}")
+        else:
+            logger.info(
+                f"Sent match notification DM to P_ID {player_id} for match {match_id}"
+            )
+
+
+# Upper bound on match notifications sent at the same time, to stay clear
+# of Telegram's flood limits when a whole round is announced at once
+NOTIFY_CONCURRENCY = 8
+
+
+async def gather_notifications(notifications: list) -> None:
+    """Awaits notification coroutines concurrently, NOTIFY_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+    async def _bounded(notification):
+        async with semaphore:
+            return await notification
+
+    results = await asyncio.gather(
+        *(_bounded(n) for n in notifications), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error sending match notification: {result}")
+
+
+# Puts a knockout winner in the first free slot of the next match and
+# schedules it once both slots are filled. SET expressions see the row's old
+# values, so a filled player1 slot means the winner goes into player2 and the
+# match now has both players.
+_ADVANCE_WINNER_SQL = """
+    UPDATE matches SET
+        player1_user_id = COALESCE(player1_user_id, :user_id),
+        player1_username = CASE WHEN player1_user_id IS NULL
+            THEN :username ELSE player1_username END,
+        player2_user_id = CASE WHEN player1_user_id IS NOT NULL
+            THEN :user_id ELSE player2_user_id END,
+        player2_username = CASE WHEN player1_user_id IS NOT NULL
+            THEN :username ELSE player2_username END,
+        status = CASE WHEN player1_user_id IS NOT NULL OR player2_user_id IS NOT NULL
+            THEN 'scheduled' ELSE status END
+    WHERE match_id = :match_id
+    RETURNING player1_user_id, player1_username, player2_user_id,
+              player2_username, status
+"""
+
+
+def advance_winner_to_match(
+    next_match_id: int,
+    winner_user_id: int,
+    winner_username: str,
+    conn: sqlite3.Connection | None = None,
+) -> sqlite3.Row | None:
+    """
+    Places a winner in the next match in a single statement and returns the
+    updated slots and status, or None if the match doesn't exist.
+    Pass the connection of an open db_tx() to make it part of that
+    transaction.
+    """
+    params = {
+        "match_id": next_match_id,
+        "user_id": winner_user_id,
+        "username": winner_username,
+    }
+    if conn is not None:
+        rows = conn.execute(_ADVANCE_WINNER_SQL, params).fetchall()
+        return rows[0] if rows else None
+    with get_write_conn() as conn:
+        # fetchall() steps the statement to completion so it autocommits
+        rows = conn.execute(_ADVANCE_WINNER_SQL, params).fetchall()
+    return rows[0] if rows else None
+
+
+# Guarded so a result reported twice isn't added to the standings or the
+# bracket twice
+_RECORD_MATCH_SCORE_SQL = """
+    UPDATE matches SET score = ?, winner_user_id = ?, status = ?
+    WHERE match_id = ? AND status != 'completed'
+"""
+
+
+def is_knockout_match(tournament: dict, match: sqlite3.Row) -> bool:
+    """True for bracket matches: SE, the GS&KO knockout stage and the Swiss knockout stage."""
+    return (
+        tournament["type"] == "Single Elimination"
+        or (tournament["type"] == "Group Stage & Knockout" and match["group_id"] is None)
+        or tournament.get("status") == "ongoing_knockout"
+    )
+
+
+def record_match_result(
+    match: sqlite3.Row,
+    tournament: dict | None,
+    score_str: str,
+    winner_user_id: int | None,
+    new_status: str = "completed",
+) -> dict | None:
+    """
+    Writes a match result and everything it settles in one transaction: the
+    score, both players' global stats, the league or group standings, and in
+    a bracket either the winner's place in the next match or the
+    tournament's completion with the champion's achievement and leaderboard
+    points.
+    Returns None if the match doesn't exist or is already completed,
+    otherwise {"next_match": <updated next match row or None>,
+    "concluded": <whether the tournament was completed>}.
+    """
+    t_id = match["tournament_id"]
+    result = {"next_match": None, "concluded": False}
+    try:
+        with db_tx() as conn:
+            if not conn.execute(
+                _RECORD_MATCH_SCORE_SQL,
+                (score_str, winner_user_id, new_status, match["match_id"]),
+            ).rowcount:
+                logger.warning(
+                    f"Match {match['match_id']} doesn't exist or is already completed.")
+                return None
+            if not tournament or new_status != "completed":
+                return result
+            if winner_user_id is not None:
+                p1_id = match["player1_user_id"]
+                p2_id = match["player2_user_id"]
+                update_global_stats_for_players(
+                    p1_id, match["player1_username"],
+                    is_winner=(p1_id == winner_user_id), conn=conn)
+                update_global_stats_for_players(
+                    p2_id, match["player2_username"],
+                    is_winner=(p2_id == winner_user_id), conn=conn)
+
+            if is_knockout_match(tournament, match):
+                if not winner_user_id:
+                    return result
+                winner_username = get_player_username_by_id(winner_user_id)
+                if match["next_match_id"]:
+                    result["next_match"] = advance_winner_to_match(
+                        match["next_match_id"], winner_user_id, winner_username, conn=conn)
+                else:
+                    result["concluded"] = update_tournament_status(
+                        t_id, "completed", winner_user_id, winner_username, conn=conn)
+                    if result["concluded"]:
+                        award_achievement(
+                            winner_user_id, 'TOURNEY_CHAMPION', tournament_id=t_id, conn=conn)
+                        update_leaderboard(winner_user_id, winner_username, conn=conn)
+                return result
+
+            parsed_score = parse_score(score_str)
+            if parsed_score is None:
+                return result
+            p1_goals, p2_goals = parsed_score
+            if tournament["type"] in ("Round Robin", "Swiss"):
+                update_round_robin_player_stats(
+                    t_id, match["player1_user_id"], match["player1_username"],
+                    p1_goals, p2_goals, conn=conn)
+                update_round_robin_player_stats(
+                    t_id, match["player2_user_id"], match["player2_username"],
+                    p2_goals, p1_goals, conn=conn)
+            elif tournament["type"] == "Group Stage & Knockout":
+                update_group_stage_player_stats(
+                    t_id, match["group_id"], match["player1_user_id"],
+                    match["player1_username"], p1_goals, p2_goals, conn=conn)
+                update_group_stage_player_stats(
+                    t_id, match["group_id"], match["player2_user_id"],
+                    match["player2_username"], p2_goals, p1_goals, conn=conn)
+        return result
+    finally:
+        invalidate_standings(t_id, match["group_id"])
 
 
 async def update_match_score_and_progress(
@@ -2411,27 +2932,24 @@ async def update_match_score_and_progress(
     logger.debug(
         f"Updating match {match_id}. Score: {score_str}, Winner ID: {winner_user_id}, Status: {new_status}"
     )
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
     try:
-        # Update the match first
-        cursor.execute(
-            "UPDATE matches SET score = ?, winner_user_id = ?, status = ? WHERE match_id = ?",
-            (score_str, winner_user_id, new_status, match_id),
-        )
-        conn.commit()
-
-        if cursor.rowcount == 0:
-            logger.warning(f"No rows updated for match {match_id}. Match might not exist.")
+        # Fetch the fixture first; the players and bracket links don't change
+        # with the result
+        current_match_details = await run_db(get_match_details_by_match_id, match_id)
+        if not current_match_details:
+            logger.warning(f"Match {match_id} not found.")
             return False
 
-        # Now, fetch details to progress the tournament
-        current_match_details = get_match_details_by_match_id(match_id)
-        if not current_match_details:
-            logger.error(f"Failed to fetch details for updated match {match_id}")
-            return True
+        tournament = await run_db(
+            get_tournament_details_by_id, current_match_details["tournament_id"])
+        # The score, standings and bracket progression go in one transaction,
+        # run off the event loop; only the Telegram sends below stay on it
+        progress = await run_db(
+            record_match_result,
+            current_match_details, tournament, score_str, winner_user_id, new_status)
+        if progress is None:
+            return False
 
-        tournament = get_tournament_details_by_id(current_match_details["tournament_id"])
         if not tournament:
             logger.error(f"Failed to fetch T_details for match {match_id}")
             return True
@@ -2450,53 +2968,27 @@ async def update_match_score_and_progress(
                 f"   Fixture: {p1_name} vs {p2_name}\n"
                 f"   Final Score: *{score_esc}*"
             )
-            await send_creator_log(context, t_id, log_message)
+            await send_creator_log(
+                context, t_id, log_message, creator_id=tournament["creator_id"])
 
-        # --- Global Stats Update (Unchanged) ---
-        if new_status == "completed" and winner_user_id is not None:
-            p1_id = current_match_details["player1_user_id"]
-            p2_id = current_match_details["player2_user_id"]
-            update_global_stats_for_players(p1_id, current_match_details["player1_username"], is_winner=(p1_id == winner_user_id))
-            update_global_stats_for_players(p2_id, current_match_details["player2_username"], is_winner=(p2_id == winner_user_id))
-
-        p1_score, p2_score = map(int, score_str.split("-"))
-        player1_id_match = current_match_details["player1_user_id"]
-        player2_id_match = current_match_details["player2_user_id"]
+        parsed_score = parse_score(score_str)
+        is_knockout = is_knockout_match(tournament, current_match_details)
 
         # --- START OF LOGIC RESTRUCTURE AND FIX ---
 
-        # Determine if the current match is a knockout match (applies to SE, GS&KO, and Swiss KO)
-        is_knockout_match = (
-            tournament["type"] == "Single Elimination" or
-            (tournament["type"] == "Group Stage & Knockout" and current_match_details.get("group_id") is None) or
-            tournament.get("status") == "ongoing_knockout"
-        )
-
         # --- KNOCKOUT PROGRESSION LOGIC (FOR ALL APPLICABLE FORMATS) ---
-        if is_knockout_match and new_status == "completed" and winner_user_id:
-            winner_display_name = get_player_username_by_id(winner_user_id)
-            next_match_id = current_match_details.get("next_match_id")
+        if is_knockout and new_status == "completed" and winner_user_id:
+            winner_display_name = await run_db(get_player_username_by_id, winner_user_id)
+            next_match_id = current_match_details["next_match_id"]
 
             if next_match_id:  # Winner advances to the next match
-                next_match_details = get_match_details_by_match_id(next_match_id)
-                if not next_match_details:
+                updated_next_match = progress["next_match"]
+                if not updated_next_match:
                     logger.error(f"CRITICAL: next_match_id {next_match_id} not found!")
                     return True
 
-                # Place winner in the next available slot of the next match
-                if not next_match_details.get("player1_user_id"):
-                    cursor.execute("UPDATE matches SET player1_user_id = ?, player1_username = ? WHERE match_id = ?",
-                                   (winner_user_id, winner_display_name, next_match_id))
-                else:
-                    cursor.execute("UPDATE matches SET player2_user_id = ?, player2_username = ? WHERE match_id = ?",
-                                   (winner_user_id, winner_display_name, next_match_id))
-                conn.commit()
-
-                # Check if the next match is now ready to be scheduled
-                updated_next_match = get_match_details_by_match_id(next_match_id)
-                if updated_next_match and updated_next_match.get("player1_user_id") and updated_next_match.get("player2_user_id"):
-                    cursor.execute("UPDATE matches SET status = 'scheduled' WHERE match_id = ?", (next_match_id,))
-                    conn.commit()
+                # Notify both players once the next match is ready
+                if updated_next_match["player1_user_id"] and updated_next_match["player2_user_id"]:
                     logger.info(f"Next match {next_match_id} is scheduled.")
                     await notify_players_of_match(
                         context,
@@ -2510,73 +3002,73 @@ async def update_match_score_and_progress(
                     )
             else:  # This was the FINAL match
                 logger.info(f"Tournament '{tournament['name']}' concluded. Winner: {winner_display_name}")
-                if update_tournament_status(t_id, "completed", winner_user_id, winner_display_name):
-                    award_achievement(winner_user_id, 'TOURNEY_CHAMPION', tournament_id=t_id)
-                    updated_tournament_details = get_tournament_details_by_id(t_id)
+                if progress["concluded"]:
+                    updated_tournament_details = await run_db(get_tournament_details_by_id, t_id)
                     if updated_tournament_details:
                         winner_username_esc_comp = escape_markdown_v2(winner_display_name)
                         completion_message = f"🏆 Tournament *{t_name_esc}* has concluded\\!\nCongratulations to the champion: *{winner_username_esc_comp}* 🥳"
-                        await send_public_announcement(context, t_id, completion_message)
-                        update_leaderboard(winner_user_id, winner_display_name)
-                        await send_tournament_glory_board(context, updated_tournament_details, winner_user_id, winner_display_name)
+                        # The announcement and the glory board go to different
+                        # chats and don't depend on each other
+                        results = await asyncio.gather(
+                            send_public_announcement(
+                                context, t_id, completion_message,
+                                group_chat_id=tournament["group_chat_id"]),
+                            send_tournament_glory_board(context, updated_tournament_details, winner_user_id, winner_display_name),
+                            return_exceptions=True,
+                        )
+                        for result in results:
+                            if isinstance(result, Exception):
+                                logger.error(f"Completion message for T_ID {t_id} failed: {result}")
         
         # --- LEAGUE/GROUP STAGE PROGRESSION LOGIC ---
-        elif not is_knockout_match and new_status == "completed":
-            if tournament["type"] in ["Round Robin", "Swiss"]:
-                # Update standings for Player 1 & 2
-                update_round_robin_player_stats(t_id, player1_id_match, current_match_details["player1_username"], p1_score, p2_score)
-                update_round_robin_player_stats(t_id, player2_id_match, current_match_details["player2_username"], p2_score, p1_score)
-
+        elif not is_knockout and new_status == "completed":
+            if parsed_score is None:
+                logger.warning(
+                    f"Unparseable score '{score_str}' for match {match_id}; standings not updated."
+                )
+            # Standings were updated along with the match
+            elif tournament["type"] == "Swiss":
                 # Check if all matches for the current Swiss round are completed
-                if tournament["type"] == "Swiss":
-                    current_swiss_round = tournament.get("current_swiss_round", 0)
-                    num_swiss_rounds = tournament.get("num_swiss_rounds", 0)
+                current_swiss_round = tournament.get("current_swiss_round", 0)
+                num_swiss_rounds = tournament.get("num_swiss_rounds", 0)
+                
+                if not await run_db(any_scheduled_match_in_round, t_id, current_swiss_round): # Round is over
+                    logger.info(f"All matches for Swiss T_ID {t_id} Round {current_swiss_round} are complete.")
                     
-                    remaining_matches = get_matches_for_tournament(t_id, "scheduled", round_number=current_swiss_round)
-                    if not remaining_matches: # Round is over
-                        logger.info(f"All matches for Swiss T_ID {t_id} Round {current_swiss_round} are complete.")
-                        
-                        if current_swiss_round < num_swiss_rounds:
-                             await send_public_announcement(
+                    if current_swiss_round < num_swiss_rounds:
+                         await send_public_announcement(
+                            context, t_id,
+                            escape_markdown_v2(f"All matches for Round {current_swiss_round} of *{tournament['name']}* are complete! The creator can now generate the next round using `/advance_swiss_round {t_id}`."),
+                            group_chat_id=tournament["group_chat_id"],
+                        )
+                    else: # All Swiss rounds are over, time to check for knockout or end
+                        logger.info(f"All Swiss rounds completed for T_ID {t_id}.")
+                        swiss_ko_qualifiers = tournament.get("swiss_knockout_qualifiers", 0)
+                        if swiss_ko_qualifiers and swiss_ko_qualifiers >= 2:
+                            await send_public_announcement(
                                 context, t_id,
-                                escape_markdown_v2(f"All matches for Round {current_swiss_round} of *{tournament['name']}* are complete! The creator can now generate the next round using `/advance_swiss_round {t_id}`.")
+                                escape_markdown_v2(f"All Swiss rounds for *{tournament['name']}* are complete! Generating the knockout stage..."),
+                                group_chat_id=tournament["group_chat_id"],
                             )
-                        else: # All Swiss rounds are over, time to check for knockout or end
-                            logger.info(f"All Swiss rounds completed for T_ID {t_id}.")
-                            swiss_ko_qualifiers = tournament.get("swiss_knockout_qualifiers", 0)
-                            if swiss_ko_qualifiers and swiss_ko_qualifiers >= 2:
-                                await send_public_announcement(
-                                    context, t_id,
-                                    escape_markdown_v2(f"All Swiss rounds for *{tournament['name']}* are complete! Generating the knockout stage...")
-                                )
-                                await generate_swiss_knockout_bracket(context, t_id, tournament["name"], swiss_ko_qualifiers)
-                            else: # No knockout, determine winner from standings
-                                # (This part of your original code was correct)
-                                final_winner = get_round_robin_standings(t_id)
-                                if final_winner:
-                                    winner_details = final_winner[0]
-                                    update_tournament_status(t_id, "completed", winner_details['user_id'], winner_details['username'])
-                                    # ... (add glory board etc. here)
-                                else:
-                                    update_tournament_status(t_id, "completed")
-            
-            # --- (Other tournament type logic like Group Stage can go here) ---
-            # This section is simplified for clarity, assuming you will add your GS logic back in
-            elif tournament["type"] == "Group Stage & Knockout":
-                 # ... your logic for updating group standings ...
-                 # ... your logic for checking if all group matches are over and then calling the knockout generator ...
-                 pass
-
+                            await generate_swiss_knockout_bracket(context, t_id, tournament["name"], swiss_ko_qualifiers)
+                        else: # No knockout, determine winner from standings
+                            # (This part of your original code was correct)
+                            final_winner = await run_db(get_round_robin_standings, t_id)
+                            if final_winner:
+                                winner_details = final_winner[0]
+                                await run_db(
+                                    update_tournament_status, t_id, "completed",
+                                    winner_details['user_id'], winner_details['username'])
+                                # ... (add glory board etc. here)
+                            else:
+                                await run_db(update_tournament_status, t_id, "completed")
 
         # --- END OF LOGIC RESTRUCTURE AND FIX ---
 
         return True # Return success
     except sqlite3.Error as e:
         logger.error(f"DB error in update_match_score_and_progress for match {match_id}: {e}", exc_info=True)
-        conn.rollback()
         return False
-    finally:
-        conn.close()
 
 
 # --- Conversation States & Command Handlers ---
@@ -2598,6 +3090,50 @@ async def update_match_score_and_progress(
 )  # Added ASK_SWISS_KNOCKOUT_QUALIFIERS
 
 
+# --- Static keyboards (built once; markups are immutable and safe to share) ---
+MAIN_MENU_MARKUP = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("🆕 Create Tournament", callback_data="create_tournament")],
+        [InlineKeyboardButton("🏆 View Tournaments", callback_data="view_tournaments")],
+        [InlineKeyboardButton("ℹ️ Help", callback_data="help_menu")],
+    ]
+)
+
+TOURNAMENT_TYPE_MARKUP = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton(
+                "🏆 Single Elimination", callback_data="single_elimination"
+            )
+        ],
+        [InlineKeyboardButton("🔄 Round Robin", callback_data="round_robin")],
+        [InlineKeyboardButton("🌍 League & Knockout",
+                              callback_data="group_knockout")],
+        [InlineKeyboardButton("♟️ Swiss", callback_data="swiss")],
+    ]
+)
+
+
+# Group admin lists change rarely, so the admin-only checks share one
+# get_chat_administrators call per chat per TTL instead of one per command.
+ADMIN_CACHE_TTL = 300  # seconds
+# chat_id -> (time fetched on the monotonic clock, admin user IDs)
+_admin_cache: dict[int, tuple[float, frozenset[int]]] = {}
+
+
+async def _is_group_admin(bot, chat_id: int, user_id: int) -> bool:
+    """
+    Returns whether user_id is an administrator of chat_id. Errors from the
+    Bot API propagate so callers decide what a failed check means.
+    """
+    cached = _admin_cache.get(chat_id)
+    if cached is None or time.monotonic() - cached[0] >= ADMIN_CACHE_TTL:
+        admins = await bot.get_chat_administrators(chat_id)
+        cached = (time.monotonic(), frozenset(a.user.id for a in admins))
+        _admin_cache[chat_id] = cached
+    return user_id in cached[1]
+
+
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Sends a welcome message and main menu. Now admin-only in groups."""
     
@@ -2608,9 +3144,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     # 2. NEW: Admin-Only Check for Groups
     if chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            admin_ids = [admin.user.id for admin in admins]
-            if user.id not in admin_ids:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /start from non-admin {user.id} in group {chat.id}")
                 return # Silently ignore non-admins in groups
         except Exception as e:
@@ -2625,18 +3159,10 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         )
         context.user_data.clear()
 
-    # 4. Define the main menu keyboard
-    keyboard = [
-        [InlineKeyboardButton("🆕 Create Tournament", callback_data="create_tournament")],
-        [InlineKeyboardButton("🏆 View Tournaments", callback_data="view_tournaments")],
-        [InlineKeyboardButton("ℹ️ Help", callback_data="help_menu")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    # 5. Send the final welcome message
+    # 4. Send the final welcome message with the main menu keyboard
     await update.message.reply_html(
         rf"Hi {user.mention_html()}! Tournament bot. Options:",
-        reply_markup=reply_markup
+        reply_markup=MAIN_MENU_MARKUP
     )
 
 
@@ -2748,12 +3274,27 @@ async def match_history_callback(
     """Handles the pagination buttons for match history, with a permission check."""
     query = update.callback_query
 
-    # Extract target user and page number from callback_data
-    # 'mh_page_{user_id}_{page}'
+    # Extract target user, page number and keyset cursor from callback_data
+    # 'mh_page_{user_id}_{page}_{a|b}{match_id}': 'a' = the page after
+    # (older than) match_id, 'b' = the page before (newer than) it.
+    # 'mh_page_{user_id}_{page}' carries no cursor and shows the newest page;
+    # that also covers buttons sent before keyset pagination.
+    cursor_match_id = None
+    newer = False
     try:
-        _, _, target_user_id_str, page_str = query.data.split('_')
-        target_user_id = int(target_user_id_str)
-        page = int(page_str)
+        parts = query.data.split('_')
+        target_user_id = int(parts[2])
+        if len(parts) == 5:
+            page = int(parts[3])
+            direction, cursor_str = parts[4][0], parts[4][1:]
+            if direction not in ('a', 'b'):
+                raise ValueError(direction)
+            cursor_match_id = int(cursor_str)
+            newer = direction == 'b'
+        elif len(parts) == 4:
+            page = 1
+        else:
+            raise ValueError(query.data)
     except (ValueError, IndexError):
         await query.answer("Error processing page request.", show_alert=True)
         return
@@ -2770,18 +3311,22 @@ async def match_history_callback(
 
     # If the check passes, answer the query to unfreeze the button and proceed
     await query.answer()
-    await send_match_history_page(update, context, target_user_id, page=page, is_callback=True)
+    await send_match_history_page(
+        update, context, target_user_id, page=page, is_callback=True,
+        cursor_match_id=cursor_match_id, newer=newer)
 
 
 async def send_match_history_page(update: Update, context: ContextTypes.DEFAULT_TYPE,
-                                  target_user_id: int, page: int, is_callback: bool = False):
+                                  target_user_id: int, page: int, is_callback: bool = False,
+                                  cursor_match_id: int | None = None, newer: bool = False):
     """A helper function to send or edit a specific page of the match history, with proper escaping."""
     user = update.effective_user
 
-    matches, total_matches = get_match_history_from_db(
-        target_user_id, page=page, limit=5)
+    matches, has_more = await run_db(
+        get_match_history_from_db,
+        target_user_id, cursor_match_id=cursor_match_id, limit=5, newer=newer)
 
-    if total_matches == 0:
+    if not matches:
         message_text = "You have no completed matches in your history."
         if is_callback:
             await update.callback_query.edit_message_text(message_text)
@@ -2789,6 +3334,10 @@ async def send_match_history_page(update: Update, context: ContextTypes.DEFAULT_
             await update.message.reply_text(message_text)
         return
 
+    # Going back we came from an older page, so there is always a next one.
+    has_next = True if newer else has_more
+    has_previous = page > 1
+
     # Build the message content
     user_name_esc = escape_markdown_v2(user.full_name)
     # Escaped parentheses
@@ -2819,14 +3368,14 @@ async def send_match_history_page(update: Update, context: ContextTypes.DEFAULT_
 
         # Safely handle old matches with no date and escape all parts
         if match['created_at']:
-            match_date = datetime.fromisoformat(
-                match['created_at']).strftime('%Y-%m-%d')
+            match_date = datetime.fromtimestamp(
+                match['created_at'], tz=timezone.utc).strftime('%Y-%m-%d')
             match_date_esc = escape_markdown_v2(match_date)
         else:
             match_date_esc = "Old Match"
 
         opponent_name_esc = escape_markdown_v2(opponent_name or "Unknown")
-        score_esc = escape_markdown_v2(score or "N/A")
+        score_esc = escape_markdown_v2(score) if score else _NA_ESC
         tournament_name_esc = escape_markdown_v2(match['tournament_name'])
 
         message_parts.append(
@@ -2838,27 +3387,30 @@ async def send_match_history_page(update: Update, context: ContextTypes.DEFAULT_
     # Build pagination buttons
     buttons = []
     row = []
-    total_pages = math.ceil(total_matches / 5)
 
-    if page > 1:
+    if has_previous:
+        # Page 1 is always re-read from the top so new results show up.
+        if page > 2:
+            previous_data = f"mh_page_{target_user_id}_{page - 1}_b{matches[0]['match_id']}"
+        else:
+            previous_data = f"mh_page_{target_user_id}_1"
         row.append(
             InlineKeyboardButton(
                 "⬅️ Previous",
-                callback_data=f"mh_page_{target_user_id}_{
-                    page - 1}"))
+                callback_data=previous_data))
 
     # A non-clickable button showing the page number
     row.append(
         InlineKeyboardButton(
-            f"Page {page}/{total_pages}",
+            f"Page {page}",
             callback_data="mh_noop"))
 
-    if page < total_pages:
+    if has_next:
         row.append(
             InlineKeyboardButton(
                 "Next ➡️",
                 callback_data=f"mh_page_{target_user_id}_{
-                    page + 1}"))
+                    page + 1}_a{matches[-1]['match_id']}"))
 
     if row:  # Only add the row if there are buttons
         buttons.append(row)
@@ -2873,6 +3425,18 @@ async def send_match_history_page(update: Update, context: ContextTypes.DEFAULT_
         await update.message.reply_text(final_message, parse_mode='MarkdownV2', reply_markup=reply_markup)
 
 
+# Tournament list headings and status words, escaped once at import
+_VIEW_GROUP_TITLE_ESC = escape_markdown_v2("🏆 Tournaments for this Group")
+_VIEW_CREATOR_TITLE_ESC = escape_markdown_v2("🏆 Your Created Tournaments")
+_VIEW_PENDING_HEADER_ESC = escape_markdown_v2(
+    "\n*📝 Pending & Open for Registration:*")
+_VIEW_OTHER_HEADER_ESC = escape_markdown_v2("\n\n*▶️ Ongoing & Completed:*")
+_STATUS_ESC = {
+    status: escape_markdown_v2(status)
+    for status in ("pending", "ongoing", "completed", "cancelled", "ongoing_knockout")
+}
+
+
 async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Displays a list of tournaments. Now admin-only in groups."""
 
@@ -2883,8 +3447,7 @@ async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT
     # Admin-Only Check (only for the typed command)
     if update.message and chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            if user.id not in [admin.user.id for admin in admins]:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /view_tournaments from non-admin {user.id} in group {chat.id}")
                 return
         except Exception as e:
@@ -2898,17 +3461,16 @@ async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT
     chat_type = update.effective_chat.type
     chat_id = update.effective_chat.id
 
-    tournaments = []
-    title = ""
-
     if chat_type in ["group", "supergroup"]:
-        title = "🏆 Tournaments for this Group"
-        tournaments = get_tournaments_from_db(limit=15, group_chat_id=chat_id)
+        title_esc = _VIEW_GROUP_TITLE_ESC
+        tournaments = await run_db(
+            get_tournaments_from_db, limit=15, group_chat_id=chat_id)
     else:
-        title = "🏆 Your Created Tournaments"
-        tournaments = get_tournaments_from_db(limit=10, creator_id=user_id)
+        title_esc = _VIEW_CREATOR_TITLE_ESC
+        tournaments = await run_db(
+            get_tournaments_from_db, limit=10, creator_id=user_id)
 
-    msg_parts = [escape_markdown_v2(title)]
+    msg_parts = [title_esc]
     kb_buttons = []
 
     if not tournaments:
@@ -2927,25 +3489,26 @@ async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT
         reply_markup = None
     else:
         pending_tournaments = [
-            t for t in tournaments if t.get("status") == "pending"]
+            t for t in tournaments if t["status"] == "pending"]
         other_tournaments = [
             t
             for t in tournaments
-            if t.get("status") in ["ongoing", "completed", "ongoing_knockout"]
+            if t["status"] in ["ongoing", "completed", "ongoing_knockout"]
         ]
 
         if pending_tournaments:
-            msg_parts.append(
-                escape_markdown_v2("\n*📝 Pending & Open for Registration:*")
-            )
+            msg_parts.append(_VIEW_PENDING_HEADER_ESC)
+            reg_counts = await run_db(
+                get_registration_counts_for_ids,
+                [t["id"] for t in pending_tournaments])
             for t in pending_tournaments:
                 n_esc, g_esc = escape_markdown_v2(
-                    t.get("name", "?")
-                ), escape_markdown_v2(t.get("game", "?"))
+                    t["name"]
+                ), escape_markdown_v2(t["game"])
                 t_id, reg_c, max_p = (
-                    t.get("id", "?"),
-                    get_registration_count(t.get("id", "?")),
-                    t.get("participants", 0),
+                    t["id"],
+                    reg_counts.get(t["id"], 0),
+                    t["participants"],
                 )
                 t_info = f"\n🔹 *{n_esc}* \\({g_esc}\\)\n   Reg: {reg_c}/{max_p}, ID: `{t_id}`"
                 msg_parts.append(t_info)
@@ -2960,15 +3523,13 @@ async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT
                     )
 
         if other_tournaments:
-            msg_parts.append(escape_markdown_v2(
-                "\n\n*▶️ Ongoing & Completed:*"))
+            msg_parts.append(_VIEW_OTHER_HEADER_ESC)
             for t in other_tournaments:
-                n_esc, stat_esc = escape_markdown_v2(
-                    t.get("name", "?")
-                ), escape_markdown_v2(t.get("status", "?"))
-                t_id = t.get("id", "?")
+                n_esc = escape_markdown_v2(t["name"])
+                stat_esc = _STATUS_ESC[t["status"]]
+                t_id = t["id"]
                 t_info = f"\n🔹 *{n_esc}*\n   Status: _{stat_esc}_, ID: `{t_id}`"
-                if t.get("status") == "completed" and t.get("winner_username"):
+                if t["status"] == "completed" and t["winner_username"]:
                     t_info += (
                         f"\n   🏆 Winner: *{
                             escape_markdown_v2(
@@ -2985,32 +3546,29 @@ async def view_tournaments_handler(update: Update, context: ContextTypes.DEFAULT
                     ]
                 )
 
-        for t in tournaments:
-            if (
-                t.get("type") == "Swiss"
-                and t.get("status") == "ongoing"
-                and t.get("creator_id") == user_id
-            ):
-                current_swiss_round = t.get("current_swiss_round", 0)
-                num_swiss_rounds = t.get("num_swiss_rounds", 0)
-                if current_swiss_round < num_swiss_rounds:
-                    remaining_matches_in_current_round = get_matches_for_tournament(
-                        t["id"],
-                        match_status="scheduled",
-                        round_number=current_swiss_round,
-                        group_id=None,
-                    )
-                    if not remaining_matches_in_current_round:
-                        kb_buttons.append(
-                            [
-                                InlineKeyboardButton(
-                                    f"➡️ Advance Swiss R{
-                                        current_swiss_round + 1}",
-                                    callback_data=f"advance_swiss_round_{
-                                        t['id']}",
-                                )
-                            ]
+        advanceable_swiss = [
+            t
+            for t in tournaments
+            if t["type"] == "Swiss"
+            and t["status"] == "ongoing"
+            and t["creator_id"] == user_id
+            and t["current_swiss_round"] < t["num_swiss_rounds"]
+        ]
+        scheduled_rounds = await run_db(
+            get_scheduled_non_group_rounds, [t["id"] for t in advanceable_swiss])
+        for t in advanceable_swiss:
+            current_swiss_round = t["current_swiss_round"]
+            if (t["id"], current_swiss_round) not in scheduled_rounds:
+                kb_buttons.append(
+                    [
+                        InlineKeyboardButton(
+                            f"➡️ Advance Swiss R{
+                                current_swiss_round + 1}",
+                            callback_data=f"advance_swiss_round_{
+                                t['id']}",
                         )
+                    ]
+                )
 
         reply_markup = InlineKeyboardMarkup(kb_buttons) if kb_buttons else None
 
@@ -3050,7 +3608,7 @@ async def handle_join_tournament(
     if not display_name:
         display_name = f"User_{user.id}"
 
-    t = get_tournament_details_by_id(t_id)
+    t = await run_db(get_tournament_details_by_id, t_id)
     msg_raw = ""
 
     if not t:
@@ -3076,7 +3634,9 @@ async def handle_join_tournament(
                 f"   Player: {user_name_esc}\n"
                 f"   Total: {reg_count}/{max_p}"
             )
-            await send_creator_log(context, t_id, log_message)
+            # Runs alongside the reply to the player below
+            context.application.create_task(send_creator_log(
+                context, t_id, log_message, creator_id=t["creator_id"]))
             # --- END OF LOG ---
         else:
             msg_raw = f"⚠️ Could not join '{t['name']}'. An error occurred."
@@ -3172,8 +3732,7 @@ async def help_command_text(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Admin-Only Check (only for the typed command)
     if update.message and chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            if user.id not in [admin.user.id for admin in admins]:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /help from non-admin {user.id} in group {chat.id}")
                 return
         except Exception as e:
@@ -3246,8 +3805,7 @@ async def create_tournament_start(update: Update, context: ContextTypes.DEFAULT_
     # Admin-Only Check for Groups
     if update.message and chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            if user.id not in [admin.user.id for admin in admins]:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /create from non-admin {user.id} in group {chat.id}")
                 try:
                     await user.send_message("Hi! It's best to create tournaments here in our private chat to keep the group tidy. Just type /create to begin.")
@@ -3370,18 +3928,7 @@ async def get_participant_count(
         return ASK_PARTICIPANT_COUNT
     context.user_data["tournament_details"]["participants"] = count
 
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                "🏆 Single Elimination", callback_data="single_elimination"
-            )
-        ],
-        [InlineKeyboardButton("🔄 Round Robin", callback_data="round_robin")],
-        [InlineKeyboardButton("🌍 League & Knockout",
-                              callback_data="group_knockout")],
-        [InlineKeyboardButton("♟️ Swiss", callback_data="swiss")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = TOURNAMENT_TYPE_MARKUP
     await update.message.reply_text(
         escape_markdown_v2(
             f"Max participants: {count}.\n\nWhat type of tournament will this be?"
@@ -3445,22 +3992,7 @@ async def get_tournament_type(
             escape_markdown_v2("Invalid selection. Please try again."),
             parse_mode="MarkdownV2",
         )
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    "🏆 Single Elimination", callback_data="single_elimination"
-                )
-            ],
-            [InlineKeyboardButton(
-                "🔄 Round Robin", callback_data="round_robin")],
-            [
-                InlineKeyboardButton(
-                    "🌍 League & Knockout", callback_data="group_knockout"
-                )
-            ],
-            [InlineKeyboardButton("♟️ Swiss", callback_data="swiss")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = TOURNAMENT_TYPE_MARKUP
         await query.edit_message_text(
             escape_markdown_v2("Please choose an available tournament type:"),
             "MarkdownV2",
@@ -3542,8 +4074,9 @@ async def get_swiss_rounds(
 
     max_players = context.user_data["tournament_details"].get(
         "participants", 0)
-    recommended_min_rounds = math.ceil(
-        math.log2(max_players)) if max_players > 1 else 1
+    recommended_min_rounds = (
+        (max_players - 1).bit_length() if max_players > 1 else 1
+    )
 
     if num_swiss_rounds < recommended_min_rounds:
         await update.message.reply_text(
@@ -3959,9 +4492,7 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
     # Step 2: Place the Admin-Only check right here.
     if chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            admin_ids = [admin.user.id for admin in admins]
-            if user.id not in admin_ids:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /start_tournament from non-admin {user.id} in group {chat.id}")
                 return # Stop the function for non-admins
         except Exception as e:
@@ -4056,7 +4587,9 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
         )
         return
 
-    if not update_tournament_status(t_id, "ongoing"):
+    # Round Robin and Swiss flip the status in the same transaction as their
+    # fixtures, so a failed start leaves the tournament pending
+    if tournament["type"] not in ("Round Robin", "Swiss") and not update_tournament_status(t_id, "ongoing"):
         await update.message.reply_text(
             escape_markdown_v2(
                 "⚠️ Failed to update tournament status to 'ongoing'. Please try again."
@@ -4090,10 +4623,11 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
             )
         )
         num_players = len(registered_players)
+        # Exact integer ceil(log2(n)): the bits needed to count up to n - 1
         num_rounds_full_bracket = (
-            math.ceil(math.log2(num_players)) if num_players > 0 else 0
+            (num_players - 1).bit_length() if num_players > 0 else 0
         )
-        full_bracket_size = 2**num_rounds_full_bracket if num_players > 0 else 0
+        full_bracket_size = 1 << num_rounds_full_bracket if num_players > 0 else 0
 
         current_round_participants_data = list(registered_players) + [
             {"user_id": None, "username": "BYE"}
@@ -4190,6 +4724,7 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                 )
 
         current_round_num_shells = 1
+        links: list[tuple[int, int]] = []
         while len(active_nodes_for_next_round) > 1:
             match_in_idx_shell = 0
             temp_active_shell_nodes = list(active_nodes_for_next_round)
@@ -4252,28 +4787,11 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                     continue
                 active_nodes_for_next_round.append(
                     {"type": "match", "id": new_shell_id}
-                )
-
-                conn_link = sqlite3.connect(DB_NAME)
-                cur_link = conn_link.cursor()
-                try:
-                    if node1_adv["type"] == "match":
-                        cur_link.execute(
-                            "UPDATE matches SET next_match_id = ? WHERE match_id = ?",
-                            (new_shell_id, node1_adv["id"]),
-                        )
-                    if node2_adv["type"] == "match":
-                        cur_link.execute(
-                            "UPDATE matches SET next_match_id = ? WHERE match_id = ?",
-                            (new_shell_id, node2_adv["id"]),
-                        )
-                    conn_link.commit()
-                except sqlite3.Error as e_link:
-                    logger.error(
-                        f"Error linking previous matches to shell {new_shell_id}: {e_link}"
-                    )
-                finally:
-                    conn_link.close()
+                )
+
+                for node_adv in (node1_adv, node2_adv):
+                    if node_adv["type"] == "match":
+                        links.append((new_shell_id, node_adv["id"]))
 
                 if shell_dets["status"] == "scheduled":
                     await notify_players_of_match(
@@ -4287,6 +4805,7 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                         shell_dets["player2_username"],
                     )
             current_round_num_shells += 1
+        link_next_matches(links)
 
         if (
             len(active_nodes_for_next_round) == 1
@@ -4321,81 +4840,82 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
     elif tournament["type"] == "Round Robin":
         parts.append(escape_markdown_v2(
             "\n🗓️ *Round Robin Fixture Generation...*"))
-        conn_rr = sqlite3.connect(DB_NAME)
-        cursor_rr = conn_rr.cursor()
+        # Generate fixtures
+        rr_schedule = generate_round_robin_fixtures(registered_players)
+        if not rr_schedule:
+            parts.append(
+                escape_markdown_v2(
+                    "⚠️ Could not generate a valid Round Robin schedule. Ensure enough players are registered."
+                )
+            )
+            await update.message.reply_text(
+                "\n".join(parts), parse_mode="MarkdownV2"
+            )
+            return
+
+        rr_rows = [
+            {
+                "tournament_id": t_id,
+                "round_number": round_num,
+                "match_in_round_index": match_in_round_idx,
+                "player1_user_id": p1_data["user_id"],
+                "player1_username": p1_data["username"],
+                "player2_user_id": p2_data["user_id"],
+                "player2_username": p2_data["username"],
+                "status": "scheduled",
+                "next_match_id": None,
+            }
+            for round_num, round_matches in enumerate(rr_schedule, start=1)
+            for match_in_round_idx, (p1_data, p2_data) in enumerate(
+                round_matches, start=1
+            )
+        ]
         try:
-            # Initialize standings for all registered players
-            for player in registered_players:
-                cursor_rr.execute(
+            # Status, standings and every fixture are written in one transaction
+            with db_tx() as conn_rr:
+                # Initialize standings for all registered players
+                conn_rr.executemany(
                     """
-                    INSERT INTO round_robin_standings (tournament_id, user_id, username, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points)
-                    VALUES (?, ?, ?, 0, 0, 0, 0, 0, 0, 0, 0)
+                    INSERT INTO round_robin_standings (tournament_id, user_id, username, games_played, wins, draws, losses, goals_for, goals_against, points)
+                    VALUES (?, ?, ?, 0, 0, 0, 0, 0, 0, 0)
                     ON CONFLICT(tournament_id, user_id) DO UPDATE SET username = EXCLUDED.username
                 """,
-                    (t_id, player["user_id"], player["username"]),
+                    [(t_id, p["user_id"], p["username"]) for p in registered_players],
                 )
-            conn_rr.commit()
-            logger.info(f"Initialized Round Robin standings for T_ID {t_id}")
+                update_tournament_status(t_id, "ongoing", conn=conn_rr)
+                rr_match_ids = add_matches_bulk(rr_rows, conn=conn_rr)
+            invalidate_standings(t_id)
+            logger.info(
+                f"Initialized Round Robin standings and added {len(rr_match_ids)} matches for T_ID {t_id}"
+            )
 
-            # Generate fixtures
-            rr_schedule = generate_round_robin_fixtures(registered_players)
-            if not rr_schedule:
-                parts.append(
-                    escape_markdown_v2(
-                        "⚠️ Could not generate a valid Round Robin schedule. Ensure enough players are registered."
+            total_matches_generated = len(rr_match_ids)
+            current_round_number = None
+            for m_dets, m_id in zip(rr_rows, rr_match_ids):
+                if m_dets["round_number"] != current_round_number:
+                    current_round_number = m_dets["round_number"]
+                    parts.append(
+                        f"\n*{
+                            escape_markdown_v2(
+                                f'--- Match Day {current_round_number} ---')}*"
                     )
-                )
-                await update.message.reply_text(
-                    "\n".join(parts), parse_mode="MarkdownV2"
-                )
-                return
-
-            total_matches_generated = 0
-            for round_num, round_matches in enumerate(rr_schedule):
-                current_round_number = round_num + 1
                 parts.append(
-                    f"\n*{
+                    f"  M\\-ID `{m_id}`: {
                         escape_markdown_v2(
-                            f'--- Match Day {current_round_number} ---')}*"
+                            m_dets['player1_username'])} vs {
+                        escape_markdown_v2(
+                            m_dets['player2_username'])}"
+                )
+                await notify_players_of_match(
+                    context,
+                    m_id,
+                    t_id,
+                    tournament["name"],
+                    m_dets["player1_user_id"],
+                    m_dets["player1_username"],
+                    m_dets["player2_user_id"],
+                    m_dets["player2_username"],
                 )
-                match_in_round_idx = 0
-                for p1_data, p2_data in round_matches:
-                    match_in_round_idx += 1
-                    m_dets = {
-                        "tournament_id": t_id,
-                        "round_number": current_round_number,
-                        "match_in_round_index": match_in_round_idx,
-                        "player1_user_id": p1_data["user_id"],
-                        "player1_username": p1_data["username"],
-                        "player2_user_id": p2_data["user_id"],
-                        "player2_username": p2_data["username"],
-                        "status": "scheduled",
-                        "next_match_id": None,
-                    }
-                    m_id = add_match_to_db(m_dets)
-                    if m_id:
-                        total_matches_generated += 1
-                        parts.append(
-                            f"  M\\-ID `{m_id}`: {
-                                escape_markdown_v2(
-                                    p1_data['username'])} vs {
-                                escape_markdown_v2(
-                                    p2_data['username'])}"
-                        )
-                        await notify_players_of_match(
-                            context,
-                            m_id,
-                            t_id,
-                            tournament["name"],
-                            p1_data["user_id"],
-                            p1_data["username"],
-                            p2_data["user_id"],
-                            p2_data["username"],
-                        )
-                    else:
-                        logger.error(
-                            f"Failed to add RR match to DB for T_ID {t_id}, round {current_round_number}."
-                        )
 
             if total_matches_generated > 0:
                 parts.append(
@@ -4432,8 +4952,6 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                     "⚠️ Error initializing standings or generating fixtures for Round Robin tournament."
                 )
             )
-        finally:
-            conn_rr.close()
 
     elif tournament["type"] == "Group Stage & Knockout":
         parts.append(
@@ -4472,17 +4990,13 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                 )
                 return
 
-            current_group_players = []
             group_size = players_per_group + \
                 (1 if i < remaining_players else 0)
-            for _ in range(group_size):
-                if player_index < num_registered:
-                    player = registered_players[player_index]
-                    add_player_to_group_db(
-                        group_id, player["user_id"], player["username"]
-                    )
-                    current_group_players.append(player)
-                    player_index += 1
+            current_group_players = registered_players[
+                player_index: player_index + group_size
+            ]
+            add_players_to_group_db(group_id, current_group_players)
+            player_index += len(current_group_players)
             groups_data.append(
                 {
                     "group_id": group_id,
@@ -4518,52 +5032,57 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
                         f'--- Generating matches for {group_name} ---')}*"
             )
             group_schedule = generate_round_robin_fixtures(group_players)
-            for round_num, round_matches in enumerate(group_schedule):
-                current_round_number = round_num + 1
+            group_rows = [
+                {
+                    "tournament_id": t_id,
+                    "round_number": round_num,
+                    "match_in_round_index": match_in_round_idx,
+                    "player1_user_id": p1_data["user_id"],
+                    "player1_username": p1_data["username"],
+                    "player2_user_id": p2_data["user_id"],
+                    "player2_username": p2_data["username"],
+                    "status": "scheduled",
+                    "next_match_id": None,
+                    "group_id": group_id,
+                }
+                for round_num, round_matches in enumerate(group_schedule, start=1)
+                for match_in_round_idx, (p1_data, p2_data) in enumerate(
+                    round_matches, start=1
+                )
+            ]
+            group_match_ids = add_matches_bulk(group_rows)
+            if group_rows and not group_match_ids:
+                logger.error(
+                    f"Failed to add Group Stage matches to DB for T_ID {t_id}, group {group_name}."
+                )
+
+            total_group_matches += len(group_match_ids)
+            current_round_number = None
+            for m_dets, m_id in zip(group_rows, group_match_ids):
+                if m_dets["round_number"] != current_round_number:
+                    current_round_number = m_dets["round_number"]
+                    parts.append(
+                        f"\n*{
+                            escape_markdown_v2(
+                                f'-- {group_name} Match Day {current_round_number} --')}*"
+                    )
                 parts.append(
-                    f"\n*{
+                    f"  M\\-ID `{m_id}`: {
+                        escape_markdown_v2(
+                            m_dets['player1_username'])} vs {
                         escape_markdown_v2(
-                            f'-- {group_name} Match Day {current_round_number} --')}*"
+                            m_dets['player2_username'])}"
+                )
+                await notify_players_of_match(
+                    context,
+                    m_id,
+                    t_id,
+                    tournament["name"],
+                    m_dets["player1_user_id"],
+                    m_dets["player1_username"],
+                    m_dets["player2_user_id"],
+                    m_dets["player2_username"],
                 )
-                match_in_round_idx = 0
-                for p1_data, p2_data in round_matches:
-                    match_in_round_idx += 1
-                    m_dets = {
-                        "tournament_id": t_id,
-                        "round_number": current_round_number,
-                        "match_in_round_index": match_in_round_idx,
-                        "player1_user_id": p1_data["user_id"],
-                        "player1_username": p1_data["username"],
-                        "player2_user_id": p2_data["user_id"],
-                        "player2_username": p2_data["username"],
-                        "status": "scheduled",
-                        "next_match_id": None,
-                        "group_id": group_id,
-                    }
-                    m_id = add_match_to_db(m_dets)
-                    if m_id:
-                        total_group_matches += 1
-                        parts.append(
-                            f"  M\\-ID `{m_id}`: {
-                                escape_markdown_v2(
-                                    p1_data['username'])} vs {
-                                escape_markdown_v2(
-                                    p2_data['username'])}"
-                        )
-                        await notify_players_of_match(
-                            context,
-                            m_id,
-                            t_id,
-                            tournament["name"],
-                            p1_data["user_id"],
-                            p1_data["username"],
-                            p2_data["user_id"],
-                            p2_data["username"],
-                        )
-                    else:
-                        logger.error(
-                            f"Failed to add Group Stage match to DB for T_ID {t_id}, group {group_name}, round {current_round_number}."
-                        )
 
         if total_group_matches > 0:
             parts.append(
@@ -4611,93 +5130,82 @@ async def start_tournament_command(update: Update, context: ContextTypes.DEFAULT
             )
             return
 
-        # Initialize standings for all registered players
-        conn_swiss_init = sqlite3.connect(DB_NAME)
-        cursor_swiss_init = conn_swiss_init.cursor()
+        # Generate matches for Round 1
+        swiss_round_1_matches = generate_swiss_round_matches(
+            t_id, 1, registered_players
+        )
+        total_matches_generated = 0
+        if not swiss_round_1_matches:
+            parts.append(
+                escape_markdown_v2(
+                    "⚠️ Could not generate matches for Swiss Round 1. Ensure enough players are registered."
+                )
+            )
+            await update.message.reply_text("\n".join(parts), parse_mode="MarkdownV2")
+            return
+
+        # Status, standings, the current round and the Round 1 matches are
+        # written in one transaction
         try:
-            for player in registered_players:
-                cursor_swiss_init.execute(
+            with db_tx() as conn_swiss_init:
+                # Initialize standings for all registered players
+                conn_swiss_init.executemany(
                     """
-                    INSERT INTO round_robin_standings (tournament_id, user_id, username, games_played, wins, draws, losses, goals_for, goals_against, goal_difference, points)
-                    VALUES (?, ?, ?, 0, 0, 0, 0, 0, 0, 0, 0)
+                    INSERT INTO round_robin_standings (tournament_id, user_id, username, games_played, wins, draws, losses, goals_for, goals_against, points)
+                    VALUES (?, ?, ?, 0, 0, 0, 0, 0, 0, 0)
                     ON CONFLICT(tournament_id, user_id) DO UPDATE SET username = EXCLUDED.username
                 """,
-                    (t_id, player["user_id"], player["username"]),
+                    [(t_id, p["user_id"], p["username"]) for p in registered_players],
+                )
+                update_tournament_status(t_id, "ongoing", conn=conn_swiss_init)
+                update_tournament_swiss_round(t_id, 1, conn=conn_swiss_init)
+                swiss_match_ids = add_matches_bulk(
+                    swiss_round_1_matches, conn=conn_swiss_init
                 )
-            conn_swiss_init.commit()
-            logger.info(f"Initialized Swiss standings for T_ID {t_id}")
+            invalidate_standings(t_id)
+            logger.info(
+                f"Initialized Swiss standings and added {len(swiss_match_ids)} Round 1 matches for T_ID {t_id}"
+            )
         except sqlite3.Error as e_swiss_init:
             logger.error(
-                f"Error initializing Swiss standings for T_ID {t_id}: {e_swiss_init}"
+                f"Error initializing Swiss standings or Round 1 matches for T_ID {t_id}: {e_swiss_init}"
             )
             parts.append(
                 escape_markdown_v2(
-                    "⚠️ Error initializing standings for Swiss tournament."
+                    "⚠️ Error initializing standings or generating matches for Swiss tournament."
                 )
             )
             await update.message.reply_text("\n".join(parts), parse_mode="MarkdownV2")
             return
-        finally:
-            conn_swiss_init.close()
-
-        # Set current Swiss round to 1
-        if not update_tournament_swiss_round(t_id, 1):
-            await update.message.reply_text(
-                escape_markdown_v2(
-                    "⚠️ Failed to set current Swiss round. Please try again."
-                ),
-                parse_mode="MarkdownV2",
-            )
-            return
         # Update in memory for immediate use
         tournament["current_swiss_round"] = 1
 
-        # Generate matches for Round 1
-        swiss_round_1_matches = generate_swiss_round_matches(
-            t_id, 1, registered_players
-        )
-        total_matches_generated = 0
-        if not swiss_round_1_matches:
-            parts.append(
-                escape_markdown_v2(
-                    "⚠️ Could not generate matches for Swiss Round 1. Ensure enough players are registered."
-                )
-            )
-            await update.message.reply_text("\n".join(parts), parse_mode="MarkdownV2")
-            return
-
         parts.append(f"\n*{escape_markdown_v2(f'--- Swiss Round 1 ---')}*")
-        for m_dets in swiss_round_1_matches:
-            m_id = add_match_to_db(m_dets)
-            if m_id:
-                total_matches_generated += 1
-                if m_dets["status"] == "bye":
-                    parts.append(
-                        f"  M\\-ID `{m_id}`: {
-                            escape_markdown_v2(
-                                m_dets['player1_username'])} gets a *BYE*"
-                    )
-                else:
-                    parts.append(
-                        f"  M\\-ID `{m_id}`: {
-                            escape_markdown_v2(
-                                m_dets['player1_username'])} vs {
-                            escape_markdown_v2(
-                                m_dets['player2_username'])}"
-                    )
-                    await notify_players_of_match(
-                        context,
-                        m_id,
-                        t_id,
-                        tournament["name"],
-                        m_dets["player1_user_id"],
-                        m_dets["player1_username"],
-                        m_dets["player2_user_id"],
-                        m_dets["player2_username"],
-                    )
+        for m_dets, m_id in zip(swiss_round_1_matches, swiss_match_ids):
+            total_matches_generated += 1
+            if m_dets["status"] == "bye":
+                parts.append(
+                    f"  M\\-ID `{m_id}`: {
+                        escape_markdown_v2(
+                            m_dets['player1_username'])} gets a *BYE*"
+                )
             else:
-                logger.error(
-                    f"Failed to add Swiss match to DB for T_ID {t_id}, round 1."
+                parts.append(
+                    f"  M\\-ID `{m_id}`: {
+                        escape_markdown_v2(
+                            m_dets['player1_username'])} vs {
+                        escape_markdown_v2(
+                            m_dets['player2_username'])}"
+                )
+                await notify_players_of_match(
+                    context,
+                    m_id,
+                    t_id,
+                    tournament["name"],
+                    m_dets["player1_user_id"],
+                    m_dets["player1_username"],
+                    m_dets["player2_user_id"],
+                    m_dets["player2_username"],
                 )
 
         if total_matches_generated > 0:
@@ -4840,10 +5348,7 @@ async def advance_swiss_round_command(
         return
 
     # Check if all matches in the current round are completed
-    remaining_matches_in_current_round = get_matches_for_tournament(
-        t_id, match_status="scheduled", round_number=current_round, group_id=None
-    )
-    if remaining_matches_in_current_round:
+    if any_scheduled_match_in_round(t_id, current_round):
         await reply_method(
             text=escape_markdown_v2(
                 f"⚠️ Not all matches in Round {current_round} are completed yet. Please wait for all matches to be reported before advancing."
@@ -4902,37 +5407,36 @@ async def advance_swiss_round_command(
 
     parts.append(
         f"\n*{escape_markdown_v2(f'--- Swiss Round {new_round_num} ---')}*")
-    for m_dets in swiss_matches_for_new_round:
-        m_id = add_match_to_db(m_dets)
-        if m_id:
-            total_matches_generated += 1
-            if m_dets["status"] == "bye":
-                parts.append(
-                    f"  M\\-ID `{m_id}`: {
-                        escape_markdown_v2(
-                            m_dets['player1_username'])} gets a *BYE*"
-                )
-            else:
-                parts.append(
-                    f"  M\\-ID `{m_id}`: {
-                        escape_markdown_v2(
-                            m_dets['player1_username'])} vs {
-                        escape_markdown_v2(
-                            m_dets['player2_username'])}"
-                )
-                await notify_players_of_match(
-                    context,
-                    m_id,
-                    t_id,
-                    tournament["name"],
-                    m_dets["player1_user_id"],
-                    m_dets["player1_username"],
-                    m_dets["player2_user_id"],
-                    m_dets["player2_username"],
-                )
+    swiss_match_ids = add_matches_bulk(swiss_matches_for_new_round)
+    if not swiss_match_ids:
+        logger.error(
+            f"Failed to add Swiss matches to DB for T_ID {t_id}, round {new_round_num}."
+        )
+    for m_dets, m_id in zip(swiss_matches_for_new_round, swiss_match_ids):
+        total_matches_generated += 1
+        if m_dets["status"] == "bye":
+            parts.append(
+                f"  M\\-ID `{m_id}`: {
+                    escape_markdown_v2(
+                        m_dets['player1_username'])} gets a *BYE*"
+            )
         else:
-            logger.error(
-                f"Failed to add Swiss match to DB for T_ID {t_id}, round {new_round_num}."
+            parts.append(
+                f"  M\\-ID `{m_id}`: {
+                    escape_markdown_v2(
+                        m_dets['player1_username'])} vs {
+                    escape_markdown_v2(
+                        m_dets['player2_username'])}"
+            )
+            await notify_players_of_match(
+                context,
+                m_id,
+                t_id,
+                tournament["name"],
+                m_dets["player1_user_id"],
+                m_dets["player1_username"],
+                m_dets["player2_user_id"],
+                m_dets["player2_username"],
             )
 
     if total_matches_generated > 0:
@@ -5028,8 +5532,7 @@ async def view_tournament_matches_command(update: Update, context: ContextTypes.
     # Admin-Only Check (only for the typed command)
     if update.message and chat.type in ['group', 'supergroup']:
         try:
-            admins = await context.bot.get_chat_administrators(chat.id)
-            if user.id not in [admin.user.id for admin in admins]:
+            if not await _is_group_admin(context.bot, chat.id, user.id):
                 logger.info(f"Ignoring /view_matches from non-admin {user.id} in group {chat.id}")
                 return
         except Exception as e:
@@ -5124,13 +5627,11 @@ async def view_tournament_matches_command(update: Update, context: ContextTypes.
                     display_parts.append(
                         f"<b>{group['group_name']} Matches:</b>")
                     for m in group_matches:
-                        p1n, p2n = m.get("player1_username", "TBD"), m.get(
-                            "player2_username", "TBD"
-                        )
+                        p1n, p2n = m["player1_username"], m["player2_username"]
                         match_line = f"  <code>{
                             m['match_id']}</code>: {p1n} vs {p2n}"
                         if m["status"] == "completed":
-                            match_line += f" | <b>{m.get('score', 'N/A')}</b>"
+                            match_line += f" | <b>{m['score']}</b>"
                         else:
                             match_line += f" | <i>{m['status']}</i>"
                         display_parts.append(match_line)
@@ -5156,17 +5657,14 @@ async def view_tournament_matches_command(update: Update, context: ContextTypes.
                     for m_detail in sorted(
                         r_matches, key=lambda x: x["match_in_round_index"]
                     ):
-                        p1, p2 = m_detail.get(
-                            "player1_username", "<i>TBD</i>"
-                        ), m_detail.get("player2_username", "<i>TBD</i>")
+                        p1, p2 = m_detail["player1_username"], m_detail["player2_username"]
                         match_line = (
                             f"  <code>{
                                 m_detail['match_id']}</code>: {p1} vs {p2}"
                         )
                         if m_detail["status"] == "completed":
                             match_line += f" | <b>{
-                                m_detail.get(
-                                    'score', 'N/A')}</b>"
+                                m_detail['score']}</b>"
                         else:
                             match_line += f" | <i>{m_detail['status']}</i>"
                         display_parts.append(match_line)
@@ -5220,16 +5718,11 @@ async def view_tournament_matches_command(update: Update, context: ContextTypes.
                 display_parts.append(f"\n<b>Match Day {r_num}</b>")
                 for m in sorted(
                         r_matches, key=lambda x: x["match_in_round_index"]):
-                    p1n, p2n = m.get("player1_username", "TBD"), m.get(
-                        "player2_username", "TBD"
-                    )
+                    p1n, p2n = m["player1_username"], m["player2_username"]
                     match_line = f"  <code>{
                         m['match_id']}</code>: {p1n} vs {p2n}"
                     if m["status"] == "completed":
-                        match_line += f" | Score: <b>{
-                            m.get(
-                                'score',
-                                'N/A')}</b>"
+                        match_line += f" | Score: <b>{m['score']}</b>"
                     elif m["status"] == "bye":
                         match_line = (
                             f"  <code>{
@@ -5266,28 +5759,26 @@ async def view_tournament_matches_command(update: Update, context: ContextTypes.
                 for m_detail in sorted(
                     matches_by_round[round_num], key=lambda x: x["match_in_round_index"]
                 ):
-                    p1 = m_detail.get("player1_username", "<i>TBD</i>")
-                    p2 = m_detail.get("player2_username", "<i>TBD</i>")
+                    p1 = m_detail["player1_username"]
+                    p2 = m_detail["player2_username"]
                     next_match = (
                         f" ➡️ <code>{m_detail['next_match_id']}</code>"
-                        if m_detail.get("next_match_id")
+                        if m_detail["next_match_id"]
                         else ""
                     )
                     match_line = f"  <code>{m_detail['match_id']}</code>: "
                     if m_detail["status"] == "bye":
-                        adv_player = p1 if m_detail.get(
-                            "player1_user_id") else p2
+                        adv_player = p1 if m_detail["player1_user_id"] else p2
                         match_line += f"{adv_player} has a <b>BYE</b>{next_match}"
                     elif m_detail["status"] == "completed":
                         winner_name = (
                             p1
-                            if m_detail.get("winner_user_id")
-                            == m_detail.get("player1_user_id")
+                            if m_detail["winner_user_id"]
+                            == m_detail["player1_user_id"]
                             else p2
                         )
                         match_line += f"{p1} vs {p2} | <b>{
-                            m_detail.get(
-                                'score', 'N/A')}</b> | 🏆 {winner_name}{next_match}"
+                            m_detail['score']}</b> | 🏆 {winner_name}{next_match}"
                     else:
                         match_line += (
                             f"{p1} vs {p2} | <i>{
@@ -5393,7 +5884,7 @@ async def report_score_command(
         )
         return
 
-    match_status = match_details.get("status")
+    match_status = match_details["status"]
     if match_status in ["completed", "bye", "cancelled", "conflict"]:
         await update.message.reply_text(
             escape_markdown_v2(
@@ -5406,8 +5897,8 @@ async def report_score_command(
         )
         return
 
-    p1id = match_details.get("player1_user_id")
-    p2id = match_details.get("player2_user_id")
+    p1id = match_details["player1_user_id"]
+    p2id = match_details["player2_user_id"]
 
     if not p1id or not p2id:
         await update.message.reply_text(
@@ -5482,7 +5973,7 @@ async def report_score_command(
             # --- START OF CORRECTED LOGIC ---
             is_knockout_phase = (
                 tournament.get("type") == "Single Elimination" or
-                (tournament.get("type") == "Group Stage & Knockout" and match_details.get("group_id") is None) or
+                (tournament.get("type") == "Group Stage & Knockout" and match_details["group_id"] is None) or
                 tournament.get("status") == "ongoing_knockout"  # Correct check for Swiss KO
             )
 
@@ -5494,14 +5985,7 @@ async def report_score_command(
                     ),
                     parse_mode="MarkdownV2",
                 )
-                conn = sqlite3.connect(DB_NAME)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE matches SET status = 'conflict' WHERE match_id = ?",
-                    (match_id_arg,),
-                )
-                conn.commit()
-                conn.close()
+                update_match_status(match_id_arg, "conflict")
                 
                 creator_id = tournament.get("creator_id")
                 if creator_id:
@@ -5524,8 +6008,8 @@ async def report_score_command(
             ):
                 clear_score_submissions_for_match(match_id_arg)
                 t_name_esc = escape_markdown_v2(tournament["name"])
-                p1_name_esc = escape_markdown_v2(match_details.get("player1_username", "Player 1"))
-                p2_name_esc = escape_markdown_v2(match_details.get("player2_username", "Player 2"))
+                p1_name_esc = escape_markdown_v2(match_details["player1_username"])
+                p2_name_esc = escape_markdown_v2(match_details["player2_username"])
                 
                 winner_display_name_outcome = "It's a Tie\\!"
                 if winner_id:
@@ -5551,15 +6035,11 @@ async def report_score_command(
         else:
             # This is the score conflict logic (when reports don't match)
             # It is unchanged and correct.
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE matches SET status = 'conflict' WHERE match_id = ?", (match_id_arg,))
-            conn.commit()
-            conn.close()
+            update_match_status(match_id_arg, "conflict")
 
             t_name_esc = escape_markdown_v2(tournament["name"])
-            p1_name_esc = escape_markdown_v2(match_details.get("player1_username", "Player 1"))
-            p2_name_esc = escape_markdown_v2(match_details.get("player2_username", "Player 2"))
+            p1_name_esc = escape_markdown_v2(match_details["player1_username"])
+            p2_name_esc = escape_markdown_v2(match_details["player2_username"])
             reporter_username_esc = escape_markdown_v2(user.full_name or f"User_{user_id}")
             opponent_username_esc = escape_markdown_v2(get_player_username_by_id(opponent_id) or f"User_{opponent_id}")
             
@@ -5596,15 +6076,11 @@ async def report_score_command(
     else:
         # This is the logic for the first player reporting
         # It is unchanged and correct.
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE matches SET status = 'pending_opponent_report' WHERE match_id = ?", (match_id_arg,))
-        conn.commit()
-        conn.close()
+        update_match_status(match_id_arg, "pending_opponent_report")
 
         t_name_esc = escape_markdown_v2(tournament["name"])
-        p1_name_esc = escape_markdown_v2(match_details.get("player1_username", "Player 1"))
-        p2_name_esc = escape_markdown_v2(match_details.get("player2_username", "Player 2"))
+        p1_name_esc = escape_markdown_v2(match_details["player1_username"])
+        p2_name_esc = escape_markdown_v2(match_details["player2_username"])
         reporter_username_esc = escape_markdown_v2(user.full_name or f"User_{user_id}")
         opponent_display_name = get_player_username_by_id(opponent_id)
         opponent_mention = f"[{escape_markdown_v2(opponent_display_name)}](tg://user?id={opponent_id})"
@@ -5617,7 +6093,9 @@ async def report_score_command(
             f"   Score \\(P1 vs P2\\): *{score_log}*\n"
             f"   Status: Waiting for opponent to confirm\\."
         )
-        await send_creator_log(context, tournament["id"], log_message)
+        await send_creator_log(
+            context, tournament["id"], log_message,
+            creator_id=tournament["creator_id"])
 
         response_to_reporter = (
             f"✅ Your score for match ID `{str(match_id_arg)}` in tournament '{t_name_esc}' has been recorded\\!\n\n"
@@ -5723,8 +6201,8 @@ async def conflict_resolve_command(
         )
         return
 
-    p1id = match_details.get("player1_user_id")
-    p2id = match_details.get("player2_user_id")
+    p1id = match_details["player1_user_id"]
+    p2id = match_details["player2_user_id"]
     if not p1id or not p2id:
         await update.message.reply_text(
             escape_markdown_v2(
@@ -5745,7 +6223,7 @@ async def conflict_resolve_command(
         tournament.get("type") == "Single Elimination"
         or (
             tournament.get("type") in ["Group Stage & Knockout", "Swiss"]
-            and match_details.get("group_id") is None
+            and match_details["group_id"] is None
         )
     ):
         await update.message.reply_text(
@@ -5762,10 +6240,10 @@ async def conflict_resolve_command(
         clear_score_submissions_for_match(match_id_arg)
         t_name_esc = escape_markdown_v2(tournament["name"])
         p1_display_name_match = escape_markdown_v2(
-            match_details.get("player1_username", "Player 1")
+            match_details["player1_username"]
         )
         p2_display_name_match = escape_markdown_v2(
-            match_details.get("player2_username", "Player 2")
+            match_details["player2_username"]
         )
         winner_display_name_outcome = "It's a Tie\\!"
         if winner_id:
@@ -5865,15 +6343,14 @@ async def set_announcement_group_command(
         )
         return
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
     try:
-        cursor.execute(
-            "UPDATE tournaments SET group_chat_id = ? WHERE id = ?",
-            (chat_id, tournament_id),
-        )
-        conn.commit()
-        if cursor.rowcount > 0:
+        with get_write_conn() as conn:
+            updated = conn.execute(
+                "UPDATE tournaments SET group_chat_id = ? WHERE id = ?",
+                (chat_id, tournament_id),
+            ).rowcount
+        invalidate_tournament_cache(tournament_id)
+        if updated > 0:
             t_name_esc = escape_markdown_v2(tournament["name"])
             await update.message.reply_text(
                 escape_markdown_v2(
@@ -5902,8 +6379,6 @@ async def set_announcement_group_command(
             ),
             parse_mode="MarkdownV2",
         )
-    finally:
-        conn.close()
 
 
 async def h2h_command(update: Update,
@@ -6035,7 +6510,7 @@ async def broadcast_command(
     )
 
     for player in players:
-        player_id = player.get('user_id')
+        player_id = player["user_id"]
         if not player_id:
             continue
 
@@ -6122,16 +6597,16 @@ async def remind_players_command(
     t_name_esc = escape_markdown_v2(tournament["name"])
 
     for match in all_pending_matches:
-        p1_id = match.get("player1_user_id")
-        p2_id = match.get("player2_user_id")
+        p1_id = match["player1_user_id"]
+        p2_id = match["player2_user_id"]
 
         if not p1_id or not p2_id:
             continue  # Skip matches with missing players
 
         p1_username = escape_markdown_v2(
-            match.get("player1_username", f"User_{p1_id}"))
+            match["player1_username"])
         p2_username = escape_markdown_v2(
-            match.get("player2_username", f"User_{p2_id}"))
+            match["player2_username"])
         match_id_esc = escape_markdown_v2(str(match["match_id"]))
 
         # Create personalized messages
@@ -6228,23 +6703,19 @@ async def leaderboard_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Displays the advanced global tournament winners leaderboard with full stats."""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = dict_factory
-    cursor = conn.cursor()
-
     board_message_parts = ["<b>🏆 Global Player Leaderboard</b> 🏆"]
 
     try:
         # Fetch all columns, including the new ones
-        cursor.execute(
+        with get_conn() as conn:
+            top_players = conn.execute(
+                """
+                SELECT user_id, username, points, wins, matches_played, match_wins
+                FROM leaderboard_points
+                ORDER BY points DESC, wins DESC, match_wins DESC
+                LIMIT 10
             """
-            SELECT user_id, username, points, wins, matches_played, match_wins
-            FROM leaderboard_points
-            ORDER BY points DESC, wins DESC, match_wins DESC
-            LIMIT 10
-        """
-        )
-        top_players = cursor.fetchall()
+            ).fetchall()
 
         if not top_players:
             board_message_parts.append(
@@ -6258,14 +6729,12 @@ async def leaderboard_command(
                 # Prepare all the stats for display
                 user_mention = f"<a href='tg://user?id={
                     player['user_id']}'>{
-                    player.get(
-                        'username',
-                        'Unknown')}</a>"
-                points = player.get("points", 0)
+                    player['username']}</a>"
+                points = player["points"]
                 # 'wins' column tracks tournament wins
-                trophies = player.get("wins", 0)
-                match_wins = player.get("match_wins", 0)
-                matches_played = player.get("matches_played", 0)
+                trophies = player["wins"]
+                match_wins = player["match_wins"]
+                matches_played = player["matches_played"]
                 losses = matches_played - match_wins
 
                 # Calculate win rate safely
@@ -6287,8 +6756,6 @@ async def leaderboard_command(
         board_message_parts.append(
             "\nCould not retrieve leaderboard data at this time."
         )
-    finally:
-        conn.close()
 
     final_message = "\n".join(board_message_parts)
     await update.message.reply_text(
@@ -6296,15 +6763,83 @@ async def leaderboard_command(
     )
 
 
+# Keep-alive endpoint for the host's health checks. When long polling it
+# listens on PORT. The webhook server only routes /<BOT_TOKEN> and returns
+# 404 for /, so webhook deployments must either set KEEPALIVE_PORT and point
+# the health check there, or disable the check. It runs on the bot's own
+# event loop, so no web framework or extra thread is needed.
+_KEEPALIVE_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Content-Length: 13\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+    b"Bot is alive!"
+)
+_keepalive_server: asyncio.AbstractServer | None = None
+
+
+async def _handle_keepalive(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answers any HTTP request with 'Bot is alive!'."""
+    try:
+        await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+        writer.write(_KEEPALIVE_RESPONSE)
+        await writer.drain()
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_keepalive_server(application: Application) -> None:
+    """
+    post_init hook: serves the keep-alive endpoint on PORT when polling, or
+    on KEEPALIVE_PORT (if set) in webhook mode.
+    """
+    global _keepalive_server
+    if WEBHOOK_URL:
+        if not KEEPALIVE_PORT:
+            logger.info("Webhook mode without KEEPALIVE_PORT; keep-alive endpoint disabled.")
+            return
+        port = int(KEEPALIVE_PORT)
+    else:
+        port = PORT
+    _keepalive_server = await asyncio.start_server(_handle_keepalive, "0.0.0.0", port)
+    logger.info(f"Keep-alive endpoint listening on port {port}.")
+
+
+async def stop_keepalive_server(application: Application) -> None:
+    """post_shutdown hook: closes the keep-alive endpoint."""
+    global _keepalive_server
+    if _keepalive_server is not None:
+        _keepalive_server.close()
+        await _keepalive_server.wait_closed()
+        _keepalive_server = None
+
+
 def main() -> None:
     """Main function to run the bot."""
     if BOT_TOKEN == "YOUR_BOT_TOKEN" or not BOT_TOKEN:
         print("CRITICAL ERROR: Bot token (BOT_TOKEN) is not set in the script!")
         logger.critical("Bot token not set! Exiting.")
         return
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        logger.critical(
+            f"SQLite {sqlite3.sqlite_version} is too old; "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required. Exiting."
+        )
+        return
 
     init_db()
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(start_keepalive_server)
+        .post_shutdown(stop_keepalive_server)
+        .build()
+    )
 
     conv_handler = ConversationHandler(
         entry_points=[
@@ -6450,39 +6985,24 @@ def main() -> None:
 
     application.add_error_handler(error_handler)
 
-# This is the new web server code to keep the bot alive
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "Bot is alive!"
-
-def run_flask():
-  app.run(host='0.0.0.0', port=8080)
-
-def keep_alive():
-  t = Thread(target=run_flask)
-  t.start()
-# End of new web server code
-
-def main() -> None:
-    """Main function to run the bot."""
-    if BOT_TOKEN == "YOUR_BOT_TOKEN" or not BOT_TOKEN:
-        print("CRITICAL ERROR: Bot token (BOT_TOKEN) is not set in the script!")
-        logger.critical("Bot token not set! Exiting.")
-        return
-
-    init_db()
-    # ... (all your application.add_handler lines are here) ...
-    # ... (make sure they are still inside the main() function) ...
-
-    logger.info("Bot is starting polling...")
-    print("Bot is starting polling...")
-    application.run_polling()
+    if WEBHOOK_URL:
+        logger.info("Bot is starting in webhook mode...")
+        print("Bot is starting in webhook mode...")
+        application.run_webhook(
+            listen="0.0.0.0",
+            port=PORT,
+            url_path=BOT_TOKEN,
+            webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{BOT_TOKEN}",
+        )
+    else:
+        logger.info("Bot is starting polling...")
+        print("Bot is starting polling...")
+        # Long polling: each getUpdates call blocks server-side for up to 20s
+        # instead of re-polling every few seconds while the bot is idle.
+        application.run_polling(timeout=20, poll_interval=0.0)
     logger.info("Bot has stopped.")
     print("Bot has stopped.")
 
 
 if __name__ == "__main__":
-    keep_alive()  # This starts the web server
     main()        # This starts your bot